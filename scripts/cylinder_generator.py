@@ -8,49 +8,489 @@ Author: Gas Tank Text Generator Project
 Date: July 2025
 """
 
+import os
+import ast
+import math
+import hashlib
 import random
 import logging
-from typing import Tuple, Optional
+import numpy as np
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Hashable, List, Optional, Tuple
 
 try:
     import bpy
     import bmesh
-    from mathutils import Vector
+    from mathutils import Matrix, Vector
 except ImportError:
     print("Warning: bpy not available - this module requires Blender")
 
+from utils import undo_disabled, is_alive
+
 logger = logging.getLogger(__name__)
 
+# Datablock caches shared by every CylinderGenerator in the Blender session, so
+# separate generator instances reuse the same meshes and compiled material
+_MATERIAL_CACHE = {}
+_MESH_CACHE = {}
+_BATCH_COLLECTIONS = {}
+_IMAGE_CACHE = {}
+
+# Standard gas cylinder proportions (height:diameter ratios) - increased radius for larger appearance.
+# 'caps' can be turned off for sizes whose top and bottom are never in view.
+_CYLINDER_CONFIGS = MappingProxyType({
+    'small': MappingProxyType({'height': 2.0, 'radius': 0.6, 'name': 'Small Tank', 'caps': True}),      # Increased from 0.4
+    'medium': MappingProxyType({'height': 3.0, 'radius': 0.8, 'name': 'Medium Tank', 'caps': True}),    # Increased from 0.5
+    'large': MappingProxyType({'height': 4.0, 'radius': 1.0, 'name': 'Large Tank', 'caps': True}),      # Increased from 0.6
+    'industrial': MappingProxyType({'height': 5.0, 'radius': 1.2, 'name': 'Industrial Tank', 'caps': True})  # Increased from 0.7
+})
+
+# Industrial color palette for gas cylinders, one RGBA row per color
+_INDUSTRIAL_COLORS = np.array([
+    [0.2, 0.4, 0.8, 1.0],  # Blue
+    [0.3, 0.5, 0.3, 1.0],  # Green
+    [0.6, 0.6, 0.6, 1.0],  # Gray
+    [0.7, 0.2, 0.2, 1.0],  # Red
+    [0.8, 0.8, 0.2, 1.0],  # Yellow
+    [0.4, 0.4, 0.4, 1.0],  # Dark Gray
+    [0.8, 0.4, 0.0, 1.0],  # Orange
+], dtype=np.float32)
+_INDUSTRIAL_COLORS.flags.writeable = False
+
+# Custom properties recording the dimensions a cylinder was generated with
+HEIGHT_PROP = "_gen_h"
+RADIUS_PROP = "_gen_r"
+
+# Custom property holding repr(cache key) on cached datablocks, so a saved template
+# can be loaded straight back into the caches
+CACHE_KEY_PROP = "_gen_cache_key"
+
+
+def _cached_datablock(cache: Dict[Hashable, 'bpy.types.ID'], key: Hashable) -> Optional['bpy.types.ID']:
+    """
+    Look up a cached Blender datablock, dropping entries that were removed from bpy.data.
+    
+    Args:
+        cache: Mapping of cache keys to datablocks
+        key: Key to look up
+        
+    Returns:
+        The cached datablock, or None if missing or no longer valid
+    """
+    
+    datablock = cache.get(key)
+    if datablock is None:
+        return None
+    
+    if not is_alive(datablock):
+        del cache[key]
+        return None
+    
+    return datablock
+
+
+@lru_cache(maxsize=None)
+def _cylinder_topology(segments: int, caps: bool = True) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Precompute the unit ring and polygon layout of a cylinder, once per segment count.
+    
+    Args:
+        segments: Number of segments around the circumference
+        caps: Whether to close the top and bottom with n-gons
+        
+    Returns:
+        Tuple of (unit ring xy (segments, 2), loop vertex indices, polygon loop
+        starts, polygon loop totals); the arrays are read-only
+    """
+    
+    theta = np.arange(segments) * (2.0 * np.pi / segments)
+    unit_ring = np.stack([np.cos(theta), np.sin(theta)], axis=1)
+    
+    # Side quads wound counter-clockwise from outside, then one n-gon per cap
+    index = np.arange(segments)
+    following = (index + 1) % segments
+    sides = np.stack([index, following, following + segments, index + segments], axis=1).ravel()
+    top_cap = index + segments
+    bottom_cap = index[::-1]  # Reversed so the bottom normal points down
+    
+    if caps:
+        loop_verts = np.concatenate([sides, top_cap, bottom_cap]).astype(np.int32)
+        loop_totals = np.array([4] * segments + [segments, segments], dtype=np.int32)
+    else:
+        loop_verts = sides.astype(np.int32)
+        loop_totals = np.full(segments, 4, dtype=np.int32)
+    loop_starts = np.concatenate([[0], np.cumsum(loop_totals)[:-1]]).astype(np.int32)
+    
+    for array in (unit_ring, loop_verts, loop_starts, loop_totals):
+        array.flags.writeable = False  # Shared between every mesh built from the cache
+    
+    return unit_ring, loop_verts, loop_starts, loop_totals
+
+
+@lru_cache(maxsize=None)
+def _cylinder_uvs(segments: int, caps: bool = True) -> np.ndarray:
+    """
+    Analytic per-loop UVs matching the loop order of _cylinder_topology.
+    
+    The side wall is unrolled across the upper half of UV space; the bottom and
+    top caps are discs in the lower-left and lower-right quarters.
+    
+    Args:
+        segments: Number of segments around the circumference
+        caps: Whether the mesh has cap n-gons
+        
+    Returns:
+        Read-only float32 array of shape (6 * segments, 2), or (4 * segments, 2) without caps
+    """
+    
+    index = np.arange(segments)
+    u0 = index / segments
+    u1 = (index + 1) / segments  # Last quad ends at u=1, leaving a single seam
+    sides = np.stack([np.stack([u0, np.full(segments, 0.5)], axis=1),
+                      np.stack([u1, np.full(segments, 0.5)], axis=1),
+                      np.stack([u1, np.ones(segments)], axis=1),
+                      np.stack([u0, np.ones(segments)], axis=1)], axis=1).reshape(-1, 2)
+    
+    if caps:
+        unit_ring = _cylinder_topology(segments)[0]
+        top_cap = (0.75, 0.25) + 0.25 * unit_ring
+        bottom_cap = (0.25, 0.25) + 0.25 * unit_ring[::-1] * (1.0, -1.0)  # Mirrored to keep it unflipped from below
+        uvs = np.concatenate([sides, top_cap, bottom_cap]).astype(np.float32)
+    else:
+        uvs = sides.astype(np.float32)
+    uvs.flags.writeable = False
+    
+    return uvs
+
+
+def _build_cylinder_arrays(height: float,
+                           radius: float,
+                           segments: int,
+                           caps: bool = True) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Build flat vertex and polygon arrays for a cylinder centered on the origin.
+    
+    Args:
+        height: Cylinder height (Blender units)
+        radius: Cylinder radius (Blender units)
+        segments: Number of segments around the circumference
+        caps: Whether to close the top and bottom
+        
+    Returns:
+        Tuple of (vertex coordinates (2*segments, 3), loop vertex indices,
+        polygon loop starts, polygon loop totals) ready for foreach_set
+    """
+    
+    unit_ring, loop_verts, loop_starts, loop_totals = _cylinder_topology(segments, caps)
+    ring = unit_ring * radius
+    
+    # Bottom ring followed by top ring
+    verts = np.empty((2 * segments, 3), dtype=np.float32)
+    verts[:segments, :2] = ring
+    verts[:segments, 2] = -height / 2
+    verts[segments:, :2] = ring
+    verts[segments:, 2] = height / 2
+    
+    return verts, loop_verts, loop_starts, loop_totals
+
+
+def _tileable_value_noise(rng: np.random.Generator, size: int, frequency: int) -> np.ndarray:
+    """
+    Generate smoothly interpolated value noise that tiles seamlessly.
+    
+    Args:
+        rng: NumPy random generator
+        size: Output width and height in pixels
+        frequency: Number of noise cells across the tile
+        
+    Returns:
+        Array of shape (size, size) with values in [0, 1]
+    """
+    
+    lattice = rng.random((frequency, frequency))
+    
+    coords = np.arange(size) * (frequency / size)
+    i0 = np.floor(coords).astype(np.int64)
+    i1 = (i0 + 1) % frequency  # Wrap around so opposite edges match
+    t = coords - i0
+    t = t * t * (3.0 - 2.0 * t)  # Smoothstep to hide the lattice
+    
+    rows = lattice[i0] * (1.0 - t)[:, None] + lattice[i1] * t[:, None]
+    
+    return rows[:, i0] * (1.0 - t)[None, :] + rows[:, i1] * t[None, :]
+
+
+def _bake_bump_heights(size: int,
+                       seed: int,
+                       layers: Tuple[Tuple[float, int, float, float], ...],
+                       ramp: Tuple[float, float]) -> np.ndarray:
+    """
+    Bake layered fractal noise followed by a linear ramp into a height map.
+    
+    Args:
+        size: Output width and height in pixels
+        seed: Random seed so the bake is deterministic
+        layers: (scale, detail, roughness, weight) for each noise layer
+        ramp: (black, white) ramp positions applied to the mixed noise
+        
+    Returns:
+        Array of shape (size, size) with height values in [0, 1]
+    """
+    
+    rng = np.random.default_rng(seed)
+    heights = np.zeros((size, size))
+    
+    for scale, detail, roughness, weight in layers:
+        layer = np.zeros((size, size))
+        total_amplitude = 0.0
+        
+        for octave in range(int(detail) + 1):
+            frequency = int(round(scale * 2 ** octave))
+            if frequency > size // 2:
+                break  # Finer octaves would alias at this resolution
+            amplitude = roughness ** octave
+            layer += amplitude * _tileable_value_noise(rng, size, frequency)
+            total_amplitude += amplitude
+        
+        heights += weight * (layer / total_amplitude)
+    
+    # Stretch to the full range before the ramp, like the original noise + ColorRamp
+    heights = (heights - heights.min()) / max(np.ptp(heights), 1e-8)
+    black, white = ramp
+    
+    return np.clip((heights - black) / (white - black), 0.0, 1.0)
+
+
+def _load_or_bake_bump_heights(cache_dir: Optional[str],
+                                size: int,
+                                seed: int,
+                                layers: Tuple[Tuple[float, int, float, float], ...],
+                                ramp: Tuple[float, float]) -> np.ndarray:
+    """
+    Return the baked height map from the on-disk cache, baking and storing it on a miss.
+    
+    Args:
+        cache_dir: Directory holding cached bakes (None disables the disk cache)
+        size: Output width and height in pixels
+        seed: Random seed so the bake is deterministic
+        layers: (scale, detail, roughness, weight) for each noise layer
+        ramp: (black, white) ramp positions applied to the mixed noise
+        
+    Returns:
+        Array of shape (size, size) with height values in [0, 1]
+    """
+    
+    if cache_dir is None:
+        return _bake_bump_heights(size, seed, layers, ramp)
+    
+    # Every bake parameter goes into the file name, so changed settings never hit a stale bake
+    digest = hashlib.sha1(repr((size, seed, layers, ramp)).encode('utf-8')).hexdigest()[:16]
+    cache_path = os.path.join(cache_dir, f"bump_heights_{digest}.npy")
+    
+    if os.path.exists(cache_path):
+        try:
+            heights = np.load(cache_path)
+            if heights.shape == (size, size):
+                return heights
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable bump cache {cache_path}: {e}")
+    
+    heights = _bake_bump_heights(size, seed, layers, ramp)
+    
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            np.save(f, heights)
+        os.replace(temp_path, cache_path)  # Atomic, so parallel runs never read a partial file
+    except OSError as e:
+        logger.warning(f"Could not write bump cache {cache_path}: {e}")
+    
+    return heights
+
+
+def save_template(filepath: str) -> int:
+    """
+    Write every cached cylinder mesh, material and baked image to a .blend file.
+    
+    Args:
+        filepath: Destination .blend path
+        
+    Returns:
+        Number of datablocks written
+    """
+    
+    datablocks = set()
+    for cache in (_MESH_CACHE, _MATERIAL_CACHE, _IMAGE_CACHE):
+        for key in list(cache):
+            datablock = _cached_datablock(cache, key)
+            if datablock is not None:
+                datablocks.add(datablock)
+    
+    # Generated pixels only survive the round trip when packed into the file
+    for image in _IMAGE_CACHE.values():
+        if not image.packed_file:
+            image.pack()
+    
+    bpy.data.libraries.write(filepath, datablocks, fake_user=True)
+    
+    logger.info(f"Saved {len(datablocks)} cylinder datablocks to {filepath}")
+    
+    return len(datablocks)
+
+
+def load_template(filepath: str) -> int:
+    """
+    Append cylinder datablocks from a template .blend and register them in the caches.
+    
+    Generators then reuse the loaded meshes, materials and images instead of
+    rebuilding or re-baking them.
+    
+    Args:
+        filepath: Template written by save_template
+        
+    Returns:
+        Number of datablocks registered
+    """
+    
+    with bpy.data.libraries.load(filepath, link=False) as (data_from, data_to):
+        data_to.meshes = [name for name in data_from.meshes if name.startswith("GasCylinderMesh_")]
+        data_to.materials = [name for name in data_from.materials if name.startswith("CylinderMaterial")]
+        data_to.images = [name for name in data_from.images if name.startswith("CylinderBumpHeight")]
+    
+    registered = 0
+    for datablocks, cache in ((data_to.meshes, _MESH_CACHE),
+                              (data_to.materials, _MATERIAL_CACHE),
+                              (data_to.images, _IMAGE_CACHE)):
+        for datablock in datablocks:
+            if datablock is None or CACHE_KEY_PROP not in datablock:
+                continue
+            datablock.use_fake_user = True
+            cache[ast.literal_eval(datablock[CACHE_KEY_PROP])] = datablock
+            registered += 1
+    
+    logger.info(f"Loaded {registered} cylinder datablocks from {filepath}")
+    
+    return registered
+
 
 class CylinderGenerator:
     """Generates realistic 3D gas cylinder models for text stamping."""
     
-    def __init__(self):
-        """Initialize the cylinder generator with default parameters."""
-        
-        # Standard gas cylinder proportions (height:diameter ratios) - increased radius for larger appearance
-        self.cylinder_configs = {
-            'small': {'height': 2.0, 'radius': 0.6, 'name': 'Small Tank'},      # Increased from 0.4
-            'medium': {'height': 3.0, 'radius': 0.8, 'name': 'Medium Tank'},    # Increased from 0.5
-            'large': {'height': 4.0, 'radius': 1.0, 'name': 'Large Tank'},      # Increased from 0.6
-            'industrial': {'height': 5.0, 'radius': 1.2, 'name': 'Industrial Tank'}  # Increased from 0.7
-        }
-        
-        # Industrial color palette for gas cylinders
-        self.industrial_colors = [
-            (0.2, 0.4, 0.8, 1.0),  # Blue
-            (0.3, 0.5, 0.3, 1.0),  # Green
-            (0.6, 0.6, 0.6, 1.0),  # Gray
-            (0.7, 0.2, 0.2, 1.0),  # Red
-            (0.8, 0.8, 0.2, 1.0),  # Yellow
-            (0.4, 0.4, 0.4, 1.0),  # Dark Gray
-            (0.8, 0.4, 0.0, 1.0),  # Orange
-        ]
+    # Teal-green material properties with MAXIMUM anti-reflective settings
+    TEAL_GREEN_LINEAR = (0.188, 0.529, 0.482, 1.0)  # #30877b converted to linear RGB
+    DEFAULT_ROUGHNESS = 0.95  # EXTREMELY HIGH roughness to eliminate all specular reflections
+    DEFAULT_METALLIC = 0.15   # VERY LOW metallic to minimize reflectivity
+    
+    # ANTI-REFLECTIVE Principled BSDF overrides; socket names differ between Blender
+    # versions, so only the ones present are applied (first match wins per group)
+    ANTI_REFLECTIVE_INPUTS = (
+        (('Specular IOR', 'IOR'), 1.0),                 # MINIMUM IOR to reduce reflections
+        (('Clearcoat',), 0.0),                          # NO clearcoat
+        (('Clearcoat Roughness',), 1.0),                # Maximum clearcoat roughness
+        (('Specular Tint',), (0.0, 0.0, 0.0, 1.0)),     # No specular tint (black)
+        (('Specular',), 0.0),                           # Minimum specular reflection
+        (('Sheen',), 0.0),                              # No sheen effect
+    )
+    
+    # Baked surface-bump height map replacing the procedural noise chain; each layer is
+    # (scale, detail, roughness, weight), matching the two original noise nodes and mix
+    BUMP_MAP_SIZE = 512
+    BUMP_MAP_SEED = 0
+    BUMP_NOISE_LAYERS = ((20.0, 5, 0.8, 0.7), (50.0, 2, 0.5, 0.3))
+    BUMP_RAMP = (0.3, 0.7)
+    
+    # Baked height maps are kept here between runs (None to always re-bake)
+    BUMP_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache")
+    
+    # Level-of-detail tessellation: smooth shading hides facets on the coarse mesh,
+    # which is used once the camera is far enough that the silhouette stays round
+    LOD_SEGMENTS = {'near': 32, 'far': 16}
+    LOD_FAR_DISTANCE = 6.5
+    
+    # Camera-adaptive tessellation: the fewest segments keeping the silhouette within
+    # SILHOUETTE_ERROR_PX of a true circle, picked from a small set to keep the cache small
+    SEGMENT_CHOICES = (12, 16, 24, 32)
+    SILHOUETTE_ERROR_PX = 0.5
+    
+    # Resolved (socket name, value) pairs, filled on the first material build
+    _principled_overrides = None
+    
+    def __init__(self, seed: Optional[int] = None):
+        """
+        Initialize the cylinder generator with default parameters.
+        
+        Args:
+            seed: Seed for color sampling (None for random colors)
+        """
+        
+        # Standard gas cylinder proportions and industrial palette, shared read-only
+        # by every generator so equal configurations produce equal cache keys
+        self.cylinder_configs = _CYLINDER_CONFIGS
+        self.industrial_colors = _INDUSTRIAL_COLORS
+        
+        # Size names cached once for per-cylinder random selection
+        self._size_keys = tuple(self.cylinder_configs.keys())
+        
+        self.rng = np.random.default_rng(seed)
+        
+        # Materials are deterministic, so identical configurations share one datablock
+        # (and one compiled shader) instead of rebuilding the node graph per cylinder
+        self._material_cache = _MATERIAL_CACHE
+        
+        # Canonical cylinder meshes keyed by (height, radius, segments); each generated object
+        # receives a cheap data-API copy instead of going through the operator stack
+        self._mesh_cache = _MESH_CACHE
+        
+        # Unlinked master collections instanced by create_cylinder_batch
+        self._batch_collections = _BATCH_COLLECTIONS
+        
+        # Released cylinder objects kept for reuse instead of re-registering new ones
+        self._obj_pool = []
+    
+    def sample_industrial_color(self, jitter: float = 0.05) -> np.ndarray:
+        """
+        Pick a random palette color with a small per-channel variation.
+        
+        Args:
+            jitter: Standard deviation of the RGB perturbation (0 for the exact palette color)
+            
+        Returns:
+            RGBA array, ready for create_cylinder(color=...)
+        """
+        
+        base = self.industrial_colors[self.rng.integers(len(self.industrial_colors))]
+        
+        return self._perturb_color(base, jitter) if jitter else base.copy()
+    
+    def _perturb_color(self, base: np.ndarray, jitter: float = 0.05) -> np.ndarray:
+        """
+        Add Gaussian noise to an RGBA color, keeping alpha and the [0, 1] range.
+        
+        Values are rounded to two decimals so the color-variant material cache stays bounded.
+        
+        Args:
+            base: RGBA color
+            jitter: Standard deviation of the RGB perturbation
+            
+        Returns:
+            Perturbed RGBA array
+        """
+        
+        color = np.array(base, dtype=np.float32)
+        color[:3] += self.rng.normal(0.0, jitter, 3)
+        
+        return np.round(np.clip(color, 0.0, 1.0), 2)
     
     def create_cylinder(self, 
                        size_type: Optional[str] = None, 
                        custom_height: Optional[float] = None,
-                       custom_radius: Optional[float] = None) -> bpy.types.Object:
+                       custom_radius: Optional[float] = None,
+                       lod: str = 'near',
+                       color: Optional[Tuple[float, float, float, float]] = None,
+                       shared: bool = False,
+                       camera: Optional[bpy.types.Object] = None) -> bpy.types.Object:
         """
         Create a gas cylinder with realistic proportions and materials.
         
@@ -58,6 +498,12 @@ class CylinderGenerator:
             size_type: Type of cylinder ('small', 'medium', 'large', 'industrial')
             custom_height: Override height (Blender units)
             custom_radius: Override radius (Blender units)
+            lod: Level of detail ('near' or 'far'), see select_lod()
+            color: Optional RGBA base color, e.g. one of industrial_colors
+            shared: Use the cached mesh directly instead of a private copy. Only for
+                cylinders whose geometry is never edited (e.g. not debossed).
+            camera: Already positioned render camera; when given, the segment count
+                adapts to the cylinder's projected size instead of using lod
             
         Returns:
             Blender object representing the gas cylinder
@@ -65,7 +511,7 @@ class CylinderGenerator:
         
         # Select cylinder configuration
         if size_type is None:
-            size_type = random.choice(list(self.cylinder_configs.keys()))
+            size_type = random.choice(self._size_keys)
         
         config = self.cylinder_configs.get(size_type, self.cylinder_configs['medium'])
         
@@ -75,34 +521,469 @@ class CylinderGenerator:
         
         logger.info(f"Creating {config['name']} (h={height:.2f}, r={radius:.2f})")
         
-        # Create perfect geometric cylinder with clean circular bases
-        bpy.ops.mesh.primitive_cylinder_add(
-            radius=radius,
-            depth=height,
-            location=(0, 0, height/2),  # Position bottom at origin
-            vertices=32  # Optimal vertex count for perfect circular geometry
-        )
+        if camera is not None:
+            distance = math.dist(camera.location, (0, 0, height/2))
+            segments = self.select_segments(radius, distance, camera.data.lens, camera.data.sensor_width)
+        else:
+            segments = self.LOD_SEGMENTS[lod]
+        shared = shared and not (custom_height or custom_radius)
         
-        cylinder = bpy.context.active_object
-        cylinder.name = f"GasCylinder_{size_type}"
+        # Create perfect geometric cylinder with clean circular bases
+        if custom_height or custom_radius:
+            # One-off dimensions would only fill the cache, so they get their own mesh
+            mesh = self._build_cylinder_mesh(f"GasCylinderMesh_{height:g}x{radius:g}_{segments}",
+                                             height, radius, segments, config['caps'])
+        elif shared:
+            # Standard sizes share one mesh datablock between all their objects
+            mesh = self._get_cylinder_mesh(height, radius, segments, config['caps'])
+        else:
+            # The mesh is copied because debossing modifies each cylinder's geometry
+            mesh = self._get_cylinder_mesh(height, radius, segments, config['caps']).copy()
+            mesh.use_fake_user = False  # Only the cached template should persist unused
         
-        # Apply smooth shading to the lateral surface only
-        bpy.context.view_layer.objects.active = cylinder
-        bpy.ops.object.mode_set(mode='EDIT')
+        cylinder = self._borrow_temp_obj(f"GasCylinder_{size_type}", mesh)
         
-        # Select all faces and apply smooth shading for clean surface
-        bpy.ops.mesh.select_all(action='SELECT')
-        bpy.ops.mesh.faces_shade_smooth()
+        if color is not None:
+            material = self._get_cylinder_material(color)
+            if shared:
+                # Recolor this object only - the mesh is used by every cylinder of its size
+                cylinder.material_slots[0].link = 'OBJECT'
+                cylinder.material_slots[0].material = material
+            else:
+                mesh.materials[0] = material
         
-        # Exit edit mode - keep perfect geometric form
-        bpy.ops.object.mode_set(mode='OBJECT')
+        cylinder.location = (0, 0, height/2)  # Position bottom at origin
         
-        # Create and apply material
-        material = self._create_cylinder_material()
-        cylinder.data.materials.append(material)
+        # Record the known dimensions so later queries skip the bounding-box walk
+        cylinder[HEIGHT_PROP] = height
+        cylinder[RADIUS_PROP] = radius
         
         return cylinder
     
+    def release_cylinder(self, cylinder: bpy.types.Object) -> None:
+        """
+        Return a cylinder to the object pool once it is no longer needed in the scene.
+        
+        Args:
+            cylinder: Cylinder previously returned by create_cylinder
+        """
+        
+        self._return_temp_obj(cylinder)
+    
+    def flush_pool(self) -> None:
+        """Permanently remove every pooled cylinder object and its mesh."""
+        
+        for obj in self._obj_pool:
+            if not is_alive(obj):
+                continue
+            mesh = obj.data
+            bpy.data.objects.remove(obj, do_unlink=True)
+            if mesh.users == 0:
+                bpy.data.meshes.remove(mesh)
+        
+        self._obj_pool.clear()
+    
+    def _borrow_temp_obj(self, name: str, mesh: bpy.types.Mesh) -> bpy.types.Object:
+        """
+        Take an object from the pool (or create one) and link it to the active collection.
+        
+        Args:
+            name: Name for the object
+            mesh: Mesh datablock the object should use
+            
+        Returns:
+            Object linked to the current collection using the given mesh
+        """
+        
+        obj = None
+        while self._obj_pool and obj is None:
+            candidate = self._obj_pool.pop()
+            if is_alive(candidate):
+                obj = candidate
+        
+        if obj is None:
+            obj = bpy.data.objects.new(name, mesh)
+        else:
+            previous_mesh = obj.data
+            obj.data = mesh
+            obj.name = name
+            obj.use_fake_user = False
+            if previous_mesh.users == 0:
+                bpy.data.meshes.remove(previous_mesh)
+        
+        bpy.context.collection.objects.link(obj)
+        
+        return obj
+    
+    def _return_temp_obj(self, obj: bpy.types.Object) -> None:
+        """
+        Unlink an object from the scene and keep it in the pool for later reuse.
+        
+        Args:
+            obj: Object to recycle
+        """
+        
+        for collection in list(obj.users_collection):
+            collection.objects.unlink(obj)
+        
+        obj.matrix_basis.identity()
+        obj.modifiers.clear()
+        for slot in obj.material_slots:
+            slot.link = 'DATA'  # Drop per-object color overrides of shared meshes
+        obj.use_fake_user = True  # Keep the unlinked object alive while pooled
+        
+        self._obj_pool.append(obj)
+    
+    def generate_many(self, n: int, size_type: Optional[str] = None) -> List[bpy.types.Object]:
+        """
+        Create several independent cylinders with undo recording disabled.
+        
+        Args:
+            n: Number of cylinders to create
+            size_type: Type of cylinder (None for a random size per cylinder)
+            
+        Returns:
+            List of the created cylinder objects
+        """
+        
+        with undo_disabled():
+            return [self.create_cylinder(size_type=size_type) for _ in range(n)]
+    
+    def create_cylinder_batch(self,
+                              transforms: List[Matrix],
+                              size_type: Optional[str] = None,
+                              lod: str = 'near') -> bpy.types.Object:
+        """
+        Create many identical cylinders as collection instances of one shared mesh.
+        
+        Args:
+            transforms: World matrices, one per cylinder instance
+            size_type: Type of cylinder ('small', 'medium', 'large', 'industrial')
+            lod: Level of detail ('near' or 'far'), see select_lod()
+            
+        Returns:
+            Empty object parenting every instance in the batch
+        """
+        
+        if size_type is None:
+            size_type = random.choice(self._size_keys)
+        
+        config = self.cylinder_configs.get(size_type, self.cylinder_configs['medium'])
+        master = self._get_batch_collection(config['height'], config['radius'], self.LOD_SEGMENTS[lod],
+                                            config['caps'])
+        
+        collection = bpy.context.collection
+        batch_root = bpy.data.objects.new(f"GasCylinderBatch_{size_type}", None)
+        collection.objects.link(batch_root)
+        
+        for index, matrix in enumerate(transforms):
+            instance = bpy.data.objects.new(f"GasCylinderInstance_{size_type}_{index:03d}", None)
+            instance.instance_type = 'COLLECTION'
+            instance.instance_collection = master
+            instance.parent = batch_root
+            instance.matrix_world = matrix
+            collection.objects.link(instance)
+        
+        logger.info(f"Created batch of {len(transforms)} {config['name']} instances")
+        
+        return batch_root
+    
+    def generate_transforms(self, n: int, seed: Optional[int] = None, spread: float = 10.0) -> np.ndarray:
+        """
+        Sample world matrices for a scattered batch of upright cylinders.
+        
+        Args:
+            n: Number of transforms to generate
+            seed: Random seed for reproducibility
+            spread: Side length of the square ground area to scatter over
+            
+        Returns:
+            Array of shape (n, 4, 4) float32 holding world matrices
+        """
+        
+        rng = np.random.default_rng(seed)
+        
+        positions = rng.uniform(-spread / 2, spread / 2, size=(n, 2))
+        yaw = rng.uniform(0.0, 2.0 * np.pi, size=n)
+        cos_yaw, sin_yaw = np.cos(yaw), np.sin(yaw)
+        
+        transforms = np.zeros((n, 4, 4), dtype=np.float32)
+        transforms[:, 0, 0] = cos_yaw
+        transforms[:, 0, 1] = -sin_yaw
+        transforms[:, 1, 0] = sin_yaw
+        transforms[:, 1, 1] = cos_yaw
+        transforms[:, 2, 2] = 1.0
+        transforms[:, 3, 3] = 1.0
+        transforms[:, :2, 3] = positions
+        
+        return transforms
+    
+    def create_cylinder_instancer(self,
+                                  transforms: np.ndarray,
+                                  size_type: Optional[str] = None,
+                                  lod: str = 'near') -> bpy.types.Object:
+        """
+        Scatter one shared cylinder mesh over many locations with a single instancer object.
+        
+        The instancer's vertices are uploaded in one foreach_set call and Blender
+        instances the child cylinder on each of them, so the depsgraph handles one
+        object regardless of batch size. Only the translations are used - a plain
+        cylinder is rotationally symmetric about its axis.
+        
+        Args:
+            transforms: Array of shape (n, 4, 4), e.g. from generate_transforms()
+            size_type: Type of cylinder ('small', 'medium', 'large', 'industrial')
+            lod: Level of detail ('near' or 'far'), see select_lod()
+            
+        Returns:
+            The vertex-instancing parent object
+        """
+        
+        if size_type is None:
+            size_type = random.choice(self._size_keys)
+        
+        config = self.cylinder_configs.get(size_type, self.cylinder_configs['medium'])
+        positions = np.ascontiguousarray(transforms[:, :3, 3], dtype=np.float32)
+        
+        points = bpy.data.meshes.new(f"GasCylinderScatterPoints_{size_type}")
+        points.vertices.add(len(positions))
+        points.vertices.foreach_set("co", positions.ravel())
+        points.update()
+        
+        collection = bpy.context.collection
+        
+        instancer = bpy.data.objects.new(f"GasCylinderScatter_{size_type}", points)
+        instancer.instance_type = 'VERTS'
+        collection.objects.link(instancer)
+        
+        mesh = self._get_cylinder_mesh(config['height'], config['radius'], self.LOD_SEGMENTS[lod],
+                                       config['caps'])
+        child = bpy.data.objects.new(f"GasCylinderScatterChild_{size_type}", mesh)
+        child.parent = instancer
+        child.location = (0, 0, config['height']/2)  # Position bottom on each point
+        collection.objects.link(child)
+        
+        logger.info(f"Scattered {len(positions)} {config['name']} instances")
+        
+        return instancer
+    
+    def prebuild(self) -> None:
+        """Build the cached mesh for every standard size and segment count create_cylinder() can pick."""
+        
+        # Fixed levels of detail plus the camera-adaptive choices of select_segments()
+        segment_counts = sorted(set(self.LOD_SEGMENTS.values()) | set(self.SEGMENT_CHOICES))
+        
+        for config in self.cylinder_configs.values():
+            for segments in segment_counts:
+                self._get_cylinder_mesh(config['height'], config['radius'], segments, config['caps'])
+    
+    def select_segments(self,
+                        radius: float,
+                        camera_distance: float,
+                        focal_length: float,
+                        sensor_width: float = 36.0) -> int:
+        """
+        Pick the segment count for a cylinder from its projected radius in pixels.
+        
+        A regular polygon with n sides deviates from its circle by r * (1 - cos(pi / n)),
+        so the smallest n keeping that below SILHOUETTE_ERROR_PX is chosen.
+        
+        Args:
+            radius: Cylinder radius (Blender units)
+            camera_distance: Distance from the camera to the cylinder (Blender units)
+            focal_length: Camera focal length (mm)
+            sensor_width: Camera sensor width (mm)
+            
+        Returns:
+            Segment count from SEGMENT_CHOICES
+        """
+        
+        # With automatic sensor fit the sensor width spans the larger image dimension
+        render = bpy.context.scene.render
+        resolution = max(render.resolution_x, render.resolution_y) * render.resolution_percentage / 100
+        pixels_per_unit = focal_length / sensor_width * resolution / max(camera_distance, 1e-6)
+        radius_px = radius * pixels_per_unit
+        
+        if radius_px <= self.SILHOUETTE_ERROR_PX:
+            return self.SEGMENT_CHOICES[0]
+        
+        needed = math.pi / math.acos(1.0 - self.SILHOUETTE_ERROR_PX / radius_px)
+        for segments in self.SEGMENT_CHOICES:
+            if segments >= needed:
+                return segments
+        
+        return self.SEGMENT_CHOICES[-1]
+    
+    def select_lod(self, camera_distance: float) -> str:
+        """
+        Pick the level of detail for a cylinder viewed from the given distance.
+        
+        Args:
+            camera_distance: Distance from the camera to the cylinder (Blender units)
+            
+        Returns:
+            LOD name usable as the `lod` argument of create_cylinder
+        """
+        
+        return 'far' if camera_distance >= self.LOD_FAR_DISTANCE else 'near'
+    
+    def _get_batch_collection(self,
+                              height: float,
+                              radius: float,
+                              segments: int,
+                              caps: bool = True) -> bpy.types.Collection:
+        """
+        Return the master collection instanced by cylinder batches, building it once.
+        
+        The collection is not linked to the scene, so only its instances render.
+        
+        Args:
+            height: Cylinder height (Blender units)
+            radius: Cylinder radius (Blender units)
+            segments: Number of segments around the circumference
+            caps: Whether the cylinder has top and bottom faces
+            
+        Returns:
+            Collection holding a single object that uses the cached cylinder mesh
+        """
+        
+        key = (round(height, 6), round(radius, 6), segments, caps)
+        
+        master = _cached_datablock(self._batch_collections, key)
+        if master is not None:
+            return master
+        
+        mesh = self._get_cylinder_mesh(height, radius, segments, caps)
+        
+        name = f"GasCylinderMaster_{key[0]:g}x{key[1]:g}_{segments}{'' if caps else '_open'}"
+        master = bpy.data.collections.new(name)
+        master_obj = bpy.data.objects.new(name, mesh)
+        master_obj.location = (0, 0, height/2)  # Position bottom at origin
+        master.objects.link(master_obj)
+        
+        self._batch_collections[key] = master
+        
+        return master
+    
+    def _get_cylinder_mesh(self,
+                           height: float,
+                           radius: float,
+                           segments: int = 32,
+                           caps: bool = True) -> bpy.types.Mesh:
+        """
+        Return the canonical cylinder mesh for the given dimensions, building it once.
+        
+        Args:
+            height: Cylinder height (Blender units)
+            radius: Cylinder radius (Blender units)
+            segments: Number of segments around the circumference
+            caps: Whether to close the top and bottom (open meshes are cached separately)
+            
+        Returns:
+            Cached Blender mesh centered on its origin
+        """
+        
+        key = (round(height, 6), round(radius, 6), segments, caps)
+        
+        mesh = _cached_datablock(self._mesh_cache, key)
+        if mesh is not None:
+            return mesh
+        
+        mesh = self._build_cylinder_mesh(f"GasCylinderMesh_{key[0]:g}x{key[1]:g}_{segments}{'' if caps else '_open'}",
+                                         height, radius, segments, caps)
+        
+        # Keep the template alive after every object using it has been deleted
+        mesh.use_fake_user = True
+        mesh[CACHE_KEY_PROP] = repr(key)
+        self._mesh_cache[key] = mesh
+        
+        return mesh
+    
+    def _build_cylinder_mesh(self,
+                             name: str,
+                             height: float,
+                             radius: float,
+                             segments: int,
+                             caps: bool = True) -> bpy.types.Mesh:
+        """
+        Build a new cylinder mesh datablock centered on its origin.
+        
+        Args:
+            name: Name for the mesh datablock
+            height: Cylinder height (Blender units)
+            radius: Cylinder radius (Blender units)
+            segments: Number of segments around the circumference
+            caps: Whether to close the top and bottom
+            
+        Returns:
+            New Blender mesh using the shared cylinder material
+        """
+        
+        verts, loop_verts, loop_starts, loop_totals = _build_cylinder_arrays(height, radius, segments, caps)
+        
+        # Upload the geometry in bulk - one Python/C crossing per array
+        mesh = bpy.data.meshes.new(name)
+        mesh.vertices.add(len(verts))
+        mesh.vertices.foreach_set("co", verts.ravel())
+        mesh.loops.add(len(loop_verts))
+        mesh.loops.foreach_set("vertex_index", loop_verts)
+        mesh.polygons.add(len(loop_starts))
+        mesh.polygons.foreach_set("loop_start", loop_starts)
+        if bpy.app.version < (4, 0, 0):
+            mesh.polygons.foreach_set("loop_total", loop_totals)  # Derived from loop_start since 4.0
+        
+        # Smooth shading is stored on the template so copies never enter edit mode
+        mesh.polygons.foreach_set("use_smooth", np.ones(len(loop_starts), dtype=bool))
+        
+        # Analytic UV layout, shared by every copy and instance - no unwrap operator
+        uv_layer = mesh.uv_layers.new(name="UVMap")
+        uv_layer.data.foreach_set("uv", _cylinder_uvs(segments, caps).ravel())
+        mesh.update(calc_edges=True)
+        
+        # Copies and instances inherit the shared material from the template
+        mesh.materials.append(self._get_cylinder_material())
+        
+        return mesh
+    
+    def _get_cylinder_material(self, color: Optional[Tuple[float, float, float, float]] = None) -> bpy.types.Material:
+        """
+        Return the cylinder material, building its node graph only on first use.
+        
+        Args:
+            color: Optional RGBA base color; other colors are cheap copies of the
+                default material with only the base color changed
+        
+        Returns:
+            Cached Blender material shared by every cylinder of that color
+        """
+        
+        if color is None:
+            color = self.TEAL_GREEN_LINEAR
+        color = tuple(float(c) for c in color)  # Hashable, and plain floats for the cache key
+        
+        key = (color, self.DEFAULT_ROUGHNESS, self.DEFAULT_METALLIC)
+        
+        material = _cached_datablock(self._material_cache, key)
+        if material is not None:
+            return material
+        
+        if color == self.TEAL_GREEN_LINEAR:
+            material = self._create_cylinder_material()
+        else:
+            # Copy the default graph and recolor it - the bump/mix nodes are left untouched
+            material = self._get_cylinder_material().copy()
+            material.name = "CylinderMaterial_Variant"
+            for node in material.node_tree.nodes:
+                if node.type == 'BSDF_PRINCIPLED':
+                    node.inputs['Base Color'].default_value = color
+                elif node.type == 'BSDF_DIFFUSE':
+                    node.inputs['Color'].default_value = color
+        
+        material[CACHE_KEY_PROP] = repr(key)
+        self._material_cache[key] = material
+        
+        return material
+    
     def _create_cylinder_material(self) -> bpy.types.Material:
         """
         Create a realistic PBR material for the gas cylinder with mild surface bumpiness.
@@ -149,96 +1030,104 @@ class CylinderGenerator:
         mapping.location = (-400, 0)
         mapping.inputs['Scale'].default_value = (8.0, 8.0, 8.0)  # Scale for mild texture detail
         
-        # Add noise texture for surface bumpiness (increased roughness)
-        noise_texture = material.node_tree.nodes.new(type='ShaderNodeTexNoise')
-        noise_texture.location = (-200, 0)
-        noise_texture.inputs['Scale'].default_value = 20.0      # Finer surface detail for more texture
-        noise_texture.inputs['Detail'].default_value = 5.0     # Higher detail level for more complexity
-        noise_texture.inputs['Roughness'].default_value = 0.8  # Increased roughness in noise
-        noise_texture.inputs['Distortion'].default_value = 0.4 # More distortion for realistic industrial texture
-        
-        # Add second noise texture for additional surface complexity
-        noise_texture2 = material.node_tree.nodes.new(type='ShaderNodeTexNoise')
-        noise_texture2.location = (-200, -300)
-        noise_texture2.inputs['Scale'].default_value = 50.0     # Even finer detail
-        noise_texture2.inputs['Detail'].default_value = 2.0    # Lower detail for base variation
-        noise_texture2.inputs['Roughness'].default_value = 0.5 # Medium roughness
-        noise_texture2.inputs['Distortion'].default_value = 0.1 # Slight distortion
-        
-        # Add mix node to combine both noise textures
-        mix_node = material.node_tree.nodes.new(type='ShaderNodeMix')
-        mix_node.location = (-50, -150)
-        mix_node.data_type = 'RGBA'
-        mix_node.blend_type = 'MIX'
-        mix_node.inputs['Factor'].default_value = 0.3  # Blend factor for second noise
-        
-        # Add ColorRamp to control bump intensity
-        color_ramp = material.node_tree.nodes.new(type='ShaderNodeValToRGB')
-        color_ramp.location = (0, -200)
-        
-        # Set color ramp for more pronounced bump effect
-        color_ramp.color_ramp.elements[0].position = 0.3  # Wider range for more variation  
-        color_ramp.color_ramp.elements[1].position = 0.7
-        color_ramp.color_ramp.elements[0].color = (0.0, 0.0, 0.0, 1.0)  # Black
-        color_ramp.color_ramp.elements[1].color = (1.0, 1.0, 1.0, 1.0)  # White
+        # Add baked height map - a single texture fetch instead of evaluating the
+        # noise/mix/ramp chain at every shading sample
+        height_texture = material.node_tree.nodes.new(type='ShaderNodeTexImage')
+        height_texture.location = (-200, -200)
+        height_texture.image = self._get_bump_height_image()
+        height_texture.projection = 'BOX'      # Generated coordinates are 3D, so project from all sides
+        height_texture.projection_blend = 0.2  # Soften seams between projection axes
+        height_texture.extension = 'REPEAT'
+        height_texture.interpolation = 'Linear'
         
         # Add bump node for surface displacement (increased strength)
         bump_node = material.node_tree.nodes.new(type='ShaderNodeBump')
         bump_node.location = (150, -200)
         bump_node.inputs['Strength'].default_value = 0.25  # Increased bump strength for more roughness
         
-        # Connect texture nodes (with dual noise for enhanced roughness)
+        # Connect texture nodes
         material.node_tree.links.new(tex_coord.outputs['Generated'], mapping.inputs['Vector'])
-        material.node_tree.links.new(mapping.outputs['Vector'], noise_texture.inputs['Vector'])
-        material.node_tree.links.new(mapping.outputs['Vector'], noise_texture2.inputs['Vector'])
-        material.node_tree.links.new(noise_texture.outputs['Fac'], mix_node.inputs['A'])
-        material.node_tree.links.new(noise_texture2.outputs['Fac'], mix_node.inputs['B'])
-        material.node_tree.links.new(mix_node.outputs['Result'], color_ramp.inputs['Fac'])
-        material.node_tree.links.new(color_ramp.outputs['Color'], bump_node.inputs['Height'])
+        material.node_tree.links.new(mapping.outputs['Vector'], height_texture.inputs['Vector'])
+        material.node_tree.links.new(height_texture.outputs['Color'], bump_node.inputs['Height'])
         
         # Connect normals to both shaders
         material.node_tree.links.new(bump_node.outputs['Normal'], bsdf.inputs['Normal'])
         material.node_tree.links.new(bump_node.outputs['Normal'], diffuse_bsdf.inputs['Normal'])
         
-        # Set teal-green material properties with MAXIMUM anti-reflective settings
-        teal_green_color = (0.188, 0.529, 0.482, 1.0)  # #30877b converted to linear RGB
-        roughness = 0.95  # EXTREMELY HIGH roughness to eliminate all specular reflections
-        metallic = 0.15   # VERY LOW metallic to minimize reflectivity
-        
         # Set material properties for metallic component
-        bsdf.inputs['Base Color'].default_value = teal_green_color
-        bsdf.inputs['Roughness'].default_value = roughness
-        bsdf.inputs['Metallic'].default_value = metallic
+        bsdf.inputs['Base Color'].default_value = self.TEAL_GREEN_LINEAR
+        bsdf.inputs['Roughness'].default_value = self.DEFAULT_ROUGHNESS
+        bsdf.inputs['Metallic'].default_value = self.DEFAULT_METALLIC
         
         # Set material properties for diffuse component (same color)
-        diffuse_bsdf.inputs['Color'].default_value = teal_green_color
+        diffuse_bsdf.inputs['Color'].default_value = self.TEAL_GREEN_LINEAR
         
-        # ANTI-REFLECTIVE settings for Blender 4.x - minimize all reflection sources
-        if 'Specular IOR' in bsdf.inputs:
-            bsdf.inputs['Specular IOR'].default_value = 1.0  # MINIMUM IOR to reduce reflections
-        elif 'IOR' in bsdf.inputs:
-            bsdf.inputs['IOR'].default_value = 1.0  # MINIMUM IOR
-            
-        # Remove any clearcoat effects that could cause bright spots
-        if 'Clearcoat' in bsdf.inputs:
-            bsdf.inputs['Clearcoat'].default_value = 0.0  # NO clearcoat
-        if 'Clearcoat Roughness' in bsdf.inputs:
-            bsdf.inputs['Clearcoat Roughness'].default_value = 1.0  # Maximum clearcoat roughness
-            
-        # Minimize specular effects
-        if 'Specular Tint' in bsdf.inputs:
-            bsdf.inputs['Specular Tint'].default_value = (0.0, 0.0, 0.0, 1.0)  # No specular tint (black)
-        if 'Specular' in bsdf.inputs:
-            bsdf.inputs['Specular'].default_value = 0.0  # Minimum specular reflection
-            
-        # Remove sheen effects
-        if 'Sheen' in bsdf.inputs:
-            bsdf.inputs['Sheen'].default_value = 0.0  # No sheen effect
+        # ANTI-REFLECTIVE settings - minimize all reflection sources
+        for input_name, value in self._resolve_principled_overrides(bsdf):
+            bsdf.inputs[input_name].default_value = value
         
-        logger.debug(f"Material: color={teal_green_color[:3]}, roughness={roughness:.2f}, metallic={metallic:.2f}, anti-reflective=maximum")
+        logger.debug(f"Material: color={self.TEAL_GREEN_LINEAR[:3]}, roughness={self.DEFAULT_ROUGHNESS:.2f}, metallic={self.DEFAULT_METALLIC:.2f}, anti-reflective=maximum")
         
         return material
     
+    def _get_bump_height_image(self) -> bpy.types.Image:
+        """
+        Return the baked surface-bump height image, generating it on first use.
+        
+        Returns:
+            Non-color Blender image holding the tileable height map
+        """
+        
+        key = (self.BUMP_MAP_SIZE, self.BUMP_MAP_SEED, self.BUMP_NOISE_LAYERS, self.BUMP_RAMP)
+        
+        image = _cached_datablock(_IMAGE_CACHE, key)
+        if image is not None:
+            return image
+        
+        size = self.BUMP_MAP_SIZE
+        heights = _load_or_bake_bump_heights(self.BUMP_CACHE_DIR, size, self.BUMP_MAP_SEED,
+                                             self.BUMP_NOISE_LAYERS, self.BUMP_RAMP)
+        
+        pixels = np.empty((size * size, 4), dtype=np.float32)
+        pixels[:, :3] = heights.reshape(-1, 1)
+        pixels[:, 3] = 1.0
+        
+        image = bpy.data.images.new("CylinderBumpHeight", width=size, height=size,
+                                    alpha=False, float_buffer=True)
+        image.colorspace_settings.name = 'Non-Color'
+        image.pixels.foreach_set(pixels.ravel())
+        image.use_fake_user = True
+        
+        image[CACHE_KEY_PROP] = repr(key)
+        _IMAGE_CACHE[key] = image
+        
+        logger.debug(f"Loaded {size}x{size} surface bump height map")
+        
+        return image
+    
+    @classmethod
+    def _resolve_principled_overrides(cls, bsdf: bpy.types.ShaderNode) -> List[Tuple[str, object]]:
+        """
+        Resolve which anti-reflective sockets this Blender version exposes, once per session.
+        
+        Args:
+            bsdf: A Principled BSDF node to inspect
+            
+        Returns:
+            List of (input name, value) pairs to apply
+        """
+        
+        if cls._principled_overrides is None:
+            overrides = []
+            for candidates, value in cls.ANTI_REFLECTIVE_INPUTS:
+                for input_name in candidates:
+                    if input_name in bsdf.inputs:
+                        overrides.append((input_name, value))
+                        break
+            cls._principled_overrides = overrides
+        
+        return cls._principled_overrides
+    
     def get_text_placement_area(self, cylinder: bpy.types.Object) -> Tuple[float, float]:
         """
         Calculate the suitable area for text placement on the cylinder surface.
@@ -250,9 +1139,7 @@ class CylinderGenerator:
             Tuple of (min_height, max_height) for text placement
         """
         
-        # Get cylinder dimensions
-        dimensions = cylinder.dimensions
-        height = dimensions.z
+        height, _ = self._get_cylinder_dimensions(cylinder)
         
         # Text should be placed in the middle 60% of the cylinder height
         margin = height * 0.2
@@ -272,7 +1159,73 @@ class CylinderGenerator:
             Cylinder radius in Blender units
         """
         
-        dimensions = cylinder.dimensions
-        radius = max(dimensions.x, dimensions.y) / 2
+        _, radius = self._get_cylinder_dimensions(cylinder)
         
         return radius
+    
+    def get_text_placement_areas(self, cylinders: List[bpy.types.Object]) -> np.ndarray:
+        """
+        Calculate text placement areas for many cylinders at once.
+        
+        Args:
+            cylinders: Gas cylinder objects
+            
+        Returns:
+            Array of shape (n, 2) with (min_height, max_height) per cylinder
+        """
+        
+        heights = self.get_cylinder_dimensions(cylinders)[:, 0]
+        
+        # Same middle 60% band as get_text_placement_area
+        return np.stack([heights * 0.2, heights * 0.8], axis=1)
+    
+    def get_cylinder_radii(self, cylinders: List[bpy.types.Object]) -> np.ndarray:
+        """
+        Get the radii of many gas cylinders at once.
+        
+        Args:
+            cylinders: Gas cylinder objects
+            
+        Returns:
+            Array of shape (n,) with radii in Blender units
+        """
+        
+        return self.get_cylinder_dimensions(cylinders)[:, 1]
+    
+    def get_cylinder_dimensions(self, cylinders: List[bpy.types.Object]) -> np.ndarray:
+        """
+        Get (height, radius) for many cylinders, reading the values recorded at creation.
+        
+        Args:
+            cylinders: Gas cylinder objects
+            
+        Returns:
+            Array of shape (n, 2) with (height, radius) per cylinder
+        """
+        
+        dimensions = np.empty((len(cylinders), 2))
+        for i, cylinder in enumerate(cylinders):
+            dimensions[i] = self._get_cylinder_dimensions(cylinder)
+        
+        return dimensions
+    
+    def _get_cylinder_dimensions(self, cylinder: bpy.types.Object) -> Tuple[float, float]:
+        """
+        Get cylinder height and radius, preferring the values recorded at creation.
+        
+        Args:
+            cylinder: The gas cylinder object
+            
+        Returns:
+            Tuple of (height, radius) in Blender units
+        """
+        
+        height = cylinder.get(HEIGHT_PROP)
+        radius = cylinder.get(RADIUS_PROP)
+        if height is not None and radius is not None:
+            return height, radius
+        
+        # Fall back to a single bounding-box evaluation for foreign objects
+        dx, dy, dz = cylinder.dimensions.to_tuple()
+        
+        return dz, max(dx, dy) / 2
@@ -8,25 +8,104 @@ Author: Gas Tank Text Generator Project
 Date: July 2025
 """
 
-import random
 import math
 import logging
-from typing import Tuple
+from typing import Dict, Optional, Tuple
+
+import numpy as np
 
 try:
     import bpy
-    from mathutils import Vector, Euler
+    from mathutils import Matrix, Vector, Euler
 except ImportError:
     print("Warning: bpy not available - this module requires Blender")
 
+from utils import interface_locked, is_alive
+
 logger = logging.getLogger(__name__)
 
 
+def _sample_spherical_positions(rng: np.random.Generator,
+                                n: int,
+                                dist_range: Tuple[float, float],
+                                elev_range: Tuple[float, float],
+                                azim_range: Tuple[float, float],
+                                z_offset: float = 0.0) -> np.ndarray:
+    """
+    Sample n positions on spherical shells around the Z axis in one vectorized pass.
+    
+    Args:
+        rng: Random generator to draw from
+        n: Number of positions to sample
+        dist_range: (min, max) distance from the origin
+        elev_range: (min, max) elevation angle (degrees)
+        azim_range: (min, max) azimuth angle (degrees)
+        z_offset: Height added to every sampled position
+        
+    Returns:
+        Array of shape (n, 3) with XYZ positions
+    """
+    
+    distance = rng.uniform(*dist_range, size=n)
+    elevation = np.radians(rng.uniform(*elev_range, size=n))
+    azimuth = np.radians(rng.uniform(*azim_range, size=n))
+    
+    horizontal = distance * np.cos(elevation)
+    
+    return np.stack([horizontal * np.cos(azimuth),
+                     horizontal * np.sin(azimuth),
+                     distance * np.sin(elevation) + z_offset], axis=1).astype(np.float32)
+
+
+def _look_at_matrices(positions: np.ndarray, target: Tuple[float, float, float]) -> np.ndarray:
+    """
+    World matrices placing objects at each position with -Z aimed at the target and Y kept up.
+    
+    Builds the look-at basis directly, matching direction.to_track_quat('-Z', 'Y')
+    without going through quaternions or Euler angles.
+    
+    Args:
+        positions: Array of shape (n, 3)
+        target: Point every object should face
+        
+    Returns:
+        Array of shape (n, 4, 4) with world matrices
+    """
+    
+    forward = np.asarray(target, dtype=np.float64) - positions
+    forward /= np.linalg.norm(forward, axis=1, keepdims=True)
+    
+    right = np.cross(forward, (0.0, 0.0, 1.0))
+    length = np.linalg.norm(right, axis=1, keepdims=True)
+    right = np.where(length > 1e-8, right / np.maximum(length, 1e-8), (1.0, 0.0, 0.0))  # Looking straight up/down
+    up = np.cross(right, forward)
+    
+    matrices = np.zeros((len(positions), 4, 4), dtype=np.float32)
+    matrices[:, :3, 0] = right
+    matrices[:, :3, 1] = up
+    matrices[:, :3, 2] = -forward
+    matrices[:, :3, 3] = positions
+    matrices[:, 3, 3] = 1.0
+    
+    return matrices
+
+
 class LightingCameraController:
     """Controls lighting and camera setup for diverse scene generation."""
     
-    def __init__(self):
-        """Initialize the lighting and camera controller."""
+    def __init__(self, high_quality: bool = False, seed: Optional[int] = None):
+        """
+        Initialize the lighting and camera controller.
+        
+        Args:
+            high_quality: Also add key, rim and ambient lights. The matte cylinder
+                material averages these out, so the default renders with the
+                environment and a single area light only.
+            seed: Seed for the controller's random generator (None for random scenes)
+        """
+        
+        self.high_quality = high_quality
+        self.rng = np.random.default_rng(seed)
         
         # Camera positioning parameters - adjusted for larger cylinder radius
         self.camera_distance_range = (4.0, 8.0)        # Increased distance for larger cylinders
@@ -37,164 +116,311 @@ class LightingCameraController:
         self.key_light_intensity_range = (200, 500)    # Increased from (100, 200)
         self.fill_light_intensity_range = (80, 200)    # Increased from (30, 80)
         self.rim_light_intensity_range = (120, 300)    # Increased from (50, 150)
+        self.environment_strength_range = (0.2, 0.3)   # Jitter around the original 0.25
+        
+        # Every per-sample scalar, drawn together by _sample_scene_params
+        self._scene_param_ranges = {
+            'lens': (35, 85),                           # Focal length variation
+            'key_energy': self.key_light_intensity_range,
+            'key_color_temp': (0.8, 1.2),               # Warm to cool
+            'fill_energy': self.fill_light_intensity_range,
+            'fill_size': (2.0, 4.0),                    # Large soft light
+            'rim_energy': self.rim_light_intensity_range,
+            'env_strength': self.environment_strength_range,
+        }
+        
+        # Spherical placement per posed object:
+        # (distance, elevation, azimuth, z offset, look-at target)
+        self._pose_specs = {
+            'camera': (self.camera_distance_range, self.camera_elevation_range,
+                       self.camera_azimuth_range, 1.5, (0, 0, 1.5)),
+            'key': ((10.0, 10.0), (30, 70), (0, 360), 0.0, (0, 0, 1.5)),
+            'fill': ((5.0, 9.0), (10, 40), (120, 240), 0.0, (0, 0, 1.5)),    # Opposite side
+            'rim': ((4.0, 7.0), (45, 80), (180, 360), 0.0, (0, 0, 2.0)),     # Behind and above
+        }
+        
+        # Pre-sampled (n, 4, 4) world matrices per pose kind, consumed one per sample
+        self._pose_batches: Dict[str, np.ndarray] = {}
+        self._pose_cursors: Dict[str, int] = {}
+        
+        # Persistent camera and light rig - built once, then only its transforms and
+        # light settings change per sample
+        self._rig: Dict[str, bpy.types.Object] = {}
+        for role in self.RIG_OBJECTS:
+            self._rig_object(role)
+        self._clear_existing_lights()
         
         logger.info("LightingCameraController initialized")
     
+    # Rig role -> (object name, light type or None for the camera)
+    RIG_OBJECTS = {
+        'camera': ("SceneCamera", None),
+        'key': ("KeyLight", 'SUN'),
+        'fill': ("FillLight", 'AREA'),
+        'rim': ("RimLight", 'SPOT'),
+        'ambient': ("AmbientLight", 'AREA'),
+    }
+    
+    # Rig lights only rendered with high_quality enabled
+    HIGH_QUALITY_LIGHTS = ('key', 'rim', 'ambient')
+    
+    POSE_BATCH_SIZE = 256  # Poses sampled per refill when presample_poses() was not called
+    
+    def presample_poses(self, n: int) -> None:
+        """
+        Sample camera and light poses for the next n scenes up front.
+        
+        Args:
+            n: Number of scenes that will be randomized
+        """
+        
+        for kind in self._pose_specs:
+            self._sample_pose_batch(kind, n)
+    
+    def _sample_pose_batch(self, kind: str, n: int) -> None:
+        """Sample n world matrices for one pose kind."""
+        
+        dist_range, elev_range, azim_range, z_offset, target = self._pose_specs[kind]
+        locations = _sample_spherical_positions(self.rng, n, dist_range, elev_range, azim_range, z_offset)
+        
+        self._pose_batches[kind] = _look_at_matrices(locations, target)
+        self._pose_cursors[kind] = 0
+    
+    def _next_pose(self, kind: str) -> Matrix:
+        """
+        Take the next pre-sampled pose, refilling the batch when it runs out.
+        
+        Args:
+            kind: Pose kind ('camera', 'key', 'fill' or 'rim')
+            
+        Returns:
+            World matrix to assign to the object's matrix_world
+        """
+        
+        batch = self._pose_batches.get(kind)
+        if batch is None or self._pose_cursors[kind] >= len(batch):
+            self._sample_pose_batch(kind, self.POSE_BATCH_SIZE)
+            batch = self._pose_batches[kind]
+        
+        index = self._pose_cursors[kind]
+        self._pose_cursors[kind] = index + 1
+        
+        return Matrix(batch[index].tolist())
+    
+    def _sample_scene_params(self) -> Dict[str, float]:
+        """
+        Draw every per-sample scalar (lens, light energies, colors, sizes) in one call.
+        
+        Returns:
+            Mapping of parameter name to value
+        """
+        
+        low, high = zip(*self._scene_param_ranges.values())
+        values = self.rng.uniform(low, high)
+        
+        return dict(zip(self._scene_param_ranges, values.tolist()))
+    
     def randomize_scene(self) -> None:
         """
         Randomize both lighting and camera for the current scene.
         """
         
-        self.setup_camera()
-        self.setup_lighting()
+        params = self._sample_scene_params()
+        
+        # All rig and world edits are applied as one batch
+        with interface_locked():
+            self.setup_camera(params)
+            self.setup_lighting(params)
         
         logger.debug("Scene randomization complete")
     
-    def setup_camera(self) -> bpy.types.Object:
+    def setup_camera(self, params: Optional[Dict[str, float]] = None) -> bpy.types.Object:
         """
         Setup and position camera with randomized parameters.
         
+        Args:
+            params: Scene parameters from _sample_scene_params (drawn if None)
+            
         Returns:
             Camera object
         """
         
-        # Remove existing camera if present
-        if bpy.context.scene.camera:
-            bpy.data.objects.remove(bpy.context.scene.camera, do_unlink=True)
+        if params is None:
+            params = self._sample_scene_params()
         
-        # Create new camera
-        bpy.ops.object.camera_add()
-        camera = bpy.context.active_object
-        camera.name = "SceneCamera"
+        # Reuse the persistent rig camera
+        camera = self._rig_object('camera')
         
         # Set as active camera
         bpy.context.scene.camera = camera
         
-        # Randomize camera position
-        distance = random.uniform(*self.camera_distance_range)
-        elevation = math.radians(random.uniform(*self.camera_elevation_range))
-        azimuth = math.radians(random.uniform(*self.camera_azimuth_range))
-        
-        # Calculate camera position in spherical coordinates
-        x = distance * math.cos(elevation) * math.cos(azimuth)
-        y = distance * math.cos(elevation) * math.sin(azimuth)
-        z = distance * math.sin(elevation) + 1.5  # Offset to look at cylinder center
-        
-        camera.location = (x, y, z)
-        
-        # Point camera at cylinder center
-        target_location = Vector((0, 0, 1.5))  # Cylinder center height
-        self._point_camera_at_target(camera, target_location)
+        # Place and aim in one matrix write
+        pose = self._next_pose('camera')
+        camera.matrix_world = pose
         
         # Set camera properties
-        camera.data.lens = random.uniform(35, 85)  # Focal length variation
+        camera.data.lens = params['lens']  # Focal length variation
         camera.data.sensor_width = 36  # Full frame sensor
         
+        x, y, z = pose.translation  # Read back from the sample, not the object
         logger.debug(f"Camera: pos=({x:.2f}, {y:.2f}, {z:.2f}), "
-                    f"elev={math.degrees(elevation):.1f}°, "
-                    f"azim={math.degrees(azimuth):.1f}°")
+                    f"elev={math.degrees(math.atan2(z - 1.5, math.hypot(x, y))):.1f}°, "
+                    f"azim={math.degrees(math.atan2(y, x)) % 360:.1f}°")
         
         return camera
     
-    def setup_lighting(self) -> None:
+    def setup_lighting(self, params: Optional[Dict[str, float]] = None) -> None:
         """
         Setup soft lighting system with fill light only and reduced environment lighting.
+        
+        With high_quality enabled the key, rim and ambient lights are added as well.
+        
+        Args:
+            params: Scene parameters from _sample_scene_params (drawn if None)
         """
         
-        # Clear existing lights
-        self._clear_existing_lights()
+        if params is None:
+            params = self._sample_scene_params()
         
         # Set up reduced environment lighting
-        self._setup_environment_lighting()
+        self._setup_environment_lighting(params)
         
         # Add only fill light for soft illumination
-        fill_light = self._create_fill_light()
+        fill_light = self._create_fill_light(params)
+        
+        # Extra rig lights stay in the scene but are skipped by the renderer when disabled
+        for role in self.HIGH_QUALITY_LIGHTS:
+            self._rig_object(role).hide_render = not self.high_quality
+        
+        if self.high_quality:
+            self._create_key_light(params)
+            self._create_rim_light(params)
+            self._create_ambient_light()
+            logger.debug("High-quality multi-light system created")
+        else:
+            logger.debug("Soft fill-light-only lighting system created")
+    
+    def rig_objects(self) -> Tuple[bpy.types.Object, ...]:
+        """
+        Return the persistent camera and light objects, e.g. to exclude them from scene cleanup.
+        
+        Returns:
+            Tuple of rig objects
+        """
+        
+        return tuple(self._rig_object(role) for role in self.RIG_OBJECTS)
+    
+    def _rig_object(self, role: str) -> bpy.types.Object:
+        """
+        Return the rig object for a role, creating it through the data API if missing.
+        
+        Args:
+            role: Rig role, a key of RIG_OBJECTS
+            
+        Returns:
+            Camera or light object linked to the current scene
+        """
         
-        logger.debug("Soft fill-light-only lighting system created")
+        obj = self._rig.get(role)
+        if obj is not None and not is_alive(obj):
+            obj = None
+        
+        if obj is None:
+            name, light_type = self.RIG_OBJECTS[role]
+            if light_type is None:
+                data = bpy.data.cameras.new(name)
+            else:
+                data = bpy.data.lights.new(name, type=light_type)
+            obj = bpy.data.objects.new(name, data)
+            self._rig[role] = obj
+        
+        scene_objects = bpy.context.scene.collection.objects
+        if scene_objects.get(obj.name) is None:
+            scene_objects.link(obj)
+        
+        return obj
     
     def _clear_existing_lights(self) -> None:
-        """Remove all existing lights from the scene."""
+        """Remove all lights that are not part of the rig from the scene."""
         
+        rig = set(self._rig.values())
         lights_to_remove = [obj for obj in bpy.context.scene.objects 
-                           if obj.type == 'LIGHT']
+                           if obj.type == 'LIGHT' and obj not in rig]
         
         for light in lights_to_remove:
-            bpy.data.objects.remove(light, do_unlink=True)
+            self._remove_object(light)
     
-    def _create_key_light(self) -> bpy.types.Object:
+    def _remove_object(self, obj: bpy.types.Object) -> None:
         """
-        Create the main key light (primary illumination).
+        Remove an object together with its camera/light data once nothing else uses it.
         
+        Args:
+            obj: Camera or light object to remove
+        """
+        
+        data = obj.data
+        bpy.data.objects.remove(obj, do_unlink=True)
+        
+        # Without this every sample would leave an orphaned datablock behind
+        if data is not None and data.users == 0:
+            if isinstance(data, bpy.types.Camera):
+                bpy.data.cameras.remove(data)
+            elif isinstance(data, bpy.types.Light):
+                bpy.data.lights.remove(data)
+    
+    def _create_key_light(self, params: Dict[str, float]) -> bpy.types.Object:
+        """
+        Update the main key light (primary illumination).
+        
+        Args:
+            params: Scene parameters from _sample_scene_params
+            
         Returns:
             Key light object
         """
         
-        # Create sun light for directional lighting
-        bpy.ops.object.light_add(type='SUN')
-        key_light = bpy.context.active_object
-        key_light.name = "KeyLight"
+        # Reuse the rig sun light for directional lighting
+        key_light = self._rig_object('key')
         
         # Randomize light properties
-        intensity = random.uniform(*self.key_light_intensity_range)
+        intensity = params['key_energy']
         key_light.data.energy = intensity
         
-        # Randomize light position and rotation
-        elevation = math.radians(random.uniform(30, 70))
-        azimuth = math.radians(random.uniform(0, 360))
-        
-        # Position light
-        distance = 10.0  # Increased distance for larger cylinders
-        x = distance * math.cos(elevation) * math.cos(azimuth)
-        y = distance * math.cos(elevation) * math.sin(azimuth)
-        z = distance * math.sin(elevation)
-        
-        key_light.location = (x, y, z)
-        
-        # Point light toward scene center
-        target_location = Vector((0, 0, 1.5))
-        self._point_light_at_target(key_light, target_location)
+        # Place and aim in one matrix write
+        pose = self._next_pose('key')
+        key_light.matrix_world = pose
         
         # Light color variation (warm to cool)
-        color_temp = random.uniform(0.8, 1.2)
+        color_temp = params['key_color_temp']
         key_light.data.color = (1.0, color_temp, color_temp * 0.8)
         
+        x, y, z = pose.translation
         logger.debug(f"Key light: intensity={intensity:.0f}, "
-                    f"elev={math.degrees(elevation):.1f}°")
+                    f"elev={math.degrees(math.atan2(z, math.hypot(x, y))):.1f}°")
         
         return key_light
     
-    def _create_fill_light(self) -> bpy.types.Object:
+    def _create_fill_light(self, params: Dict[str, float]) -> bpy.types.Object:
         """
-        Create fill light to soften shadows.
+        Update the fill light that softens shadows.
         
+        Args:
+            params: Scene parameters from _sample_scene_params
+            
         Returns:
             Fill light object
         """
         
-        # Create area light for soft fill lighting
-        bpy.ops.object.light_add(type='AREA')
-        fill_light = bpy.context.active_object
-        fill_light.name = "FillLight"
+        # Reuse the rig area light for soft fill lighting
+        fill_light = self._rig_object('fill')
         
         # Set fill light properties
-        intensity = random.uniform(*self.fill_light_intensity_range)
+        intensity = params['fill_energy']
         fill_light.data.energy = intensity
-        fill_light.data.size = random.uniform(2.0, 4.0)  # Large soft light
-        
-        # Position fill light opposite to key light
-        fill_elevation = math.radians(random.uniform(10, 40))
-        fill_azimuth = math.radians(random.uniform(120, 240))  # Opposite side
-        
-        distance = random.uniform(5.0, 9.0)  # Increased for larger cylinders
-        x = distance * math.cos(fill_elevation) * math.cos(fill_azimuth)
-        y = distance * math.cos(fill_elevation) * math.sin(fill_azimuth)
-        z = distance * math.sin(fill_elevation)
+        fill_light.data.size = params['fill_size']  # Large soft light
         
-        fill_light.location = (x, y, z)
-        
-        # Point toward cylinder
-        target_location = Vector((0, 0, 1.5))
-        self._point_light_at_target(fill_light, target_location)
+        # Position fill light opposite to key light, pointing toward cylinder
+        fill_light.matrix_world = self._next_pose('fill')
         
         # Cooler color for fill light
         fill_light.data.color = (0.9, 0.95, 1.0)
@@ -203,39 +429,28 @@ class LightingCameraController:
         
         return fill_light
     
-    def _create_rim_light(self) -> bpy.types.Object:
+    def _create_rim_light(self, params: Dict[str, float]) -> bpy.types.Object:
         """
-        Create rim light for edge definition.
+        Update the rim light for edge definition.
         
+        Args:
+            params: Scene parameters from _sample_scene_params
+            
         Returns:
             Rim light object
         """
         
-        # Create spot light for rim lighting
-        bpy.ops.object.light_add(type='SPOT')
-        rim_light = bpy.context.active_object
-        rim_light.name = "RimLight"
+        # Reuse the rig spot light for rim lighting
+        rim_light = self._rig_object('rim')
         
         # Set rim light properties
-        intensity = random.uniform(*self.rim_light_intensity_range)
+        intensity = params['rim_energy']
         rim_light.data.energy = intensity
         rim_light.data.spot_size = math.radians(45)  # Focused beam
         rim_light.data.spot_blend = 0.3
         
-        # Position behind and above the cylinder
-        rim_elevation = math.radians(random.uniform(45, 80))
-        rim_azimuth = math.radians(random.uniform(180, 360))
-        
-        distance = random.uniform(4.0, 7.0)  # Adjusted for larger cylinders
-        x = distance * math.cos(rim_elevation) * math.cos(rim_azimuth)
-        y = distance * math.cos(rim_elevation) * math.sin(rim_azimuth)
-        z = distance * math.sin(rim_elevation)
-        
-        rim_light.location = (x, y, z)
-        
-        # Point toward cylinder edge
-        target_location = Vector((0, 0, 2.0))
-        self._point_light_at_target(rim_light, target_location)
+        # Position behind and above the cylinder, pointing toward its edge
+        rim_light.matrix_world = self._next_pose('rim')
         
         # Slightly warm rim light color
         rim_light.data.color = (1.0, 0.95, 0.8)
@@ -244,41 +459,24 @@ class LightingCameraController:
         
         return rim_light
     
-    def _point_camera_at_target(self, 
-                               camera: bpy.types.Object, 
-                               target: Vector) -> None:
-        """
-        Point camera at target location.
-        
-        Args:
-            camera: Camera object to orient
-            target: Target location to look at
-        """
-        
-        # Calculate direction vector
-        direction = target - camera.location
-        
-        # Calculate rotation to point at target
-        rot_quat = direction.to_track_quat('-Z', 'Y')
-        camera.rotation_euler = rot_quat.to_euler()
-    
-    def _point_light_at_target(self, 
-                              light: bpy.types.Object, 
-                              target: Vector) -> None:
+    @staticmethod
+    def frame_object(target_obj: bpy.types.Object, distance_factor: float = 2.5) -> Matrix:
         """
-        Point light at target location.
+        Compute a camera world matrix that frames an object from a fixed three-quarter view.
         
         Args:
-            light: Light object to orient
-            target: Target location to illuminate
+            target_obj: Object to frame
+            distance_factor: Camera distance as a multiple of the object's largest dimension
+            
+        Returns:
+            World matrix placing the camera and looking at the object's origin
         """
         
-        # Calculate direction vector
-        direction = target - light.location
+        target = target_obj.location
+        distance = max(target_obj.dimensions) * distance_factor
+        position = np.array([[distance * 0.7, distance * 0.7, target.z + distance * 0.3]])
         
-        # Calculate rotation to point at target
-        rot_quat = direction.to_track_quat('-Z', 'Y')
-        light.rotation_euler = rot_quat.to_euler()
+        return Matrix(_look_at_matrices(position, tuple(target))[0].tolist())
     
     def set_world_background(self, color: Tuple[float, float, float] = None) -> None:
         """
@@ -314,7 +512,7 @@ class LightingCameraController:
         # Set background color
         if color is None:
             # Random neutral background
-            gray_value = random.uniform(0.1, 0.3)
+            gray_value = self.rng.uniform(0.1, 0.3)
             color = (gray_value, gray_value, gray_value)
         
         background.inputs['Color'].default_value = (*color, 1.0)
@@ -322,51 +520,68 @@ class LightingCameraController:
         
         logger.debug(f"World background set to: {color}")
     
-    def _setup_environment_lighting(self) -> None:
-        """Setup environment lighting using world shader nodes."""
+    # Name of the persistent world Value node mutated by _setup_environment_lighting
+    ENV_STRENGTH_NODE = "EnvStrength"
+    
+    def _setup_environment_lighting(self, params: Dict[str, float]) -> None:
+        """
+        Setup environment lighting using world shader nodes.
+        
+        Args:
+            params: Scene parameters from _sample_scene_params
+        """
         
         world = bpy.context.scene.world
         if not world:
             world = bpy.data.worlds.new("World")
             bpy.context.scene.world = world
         
+        # Reuse the gradient tree from earlier samples; the node is looked up by name
+        # because a reference to a node removed elsewhere (set_world_background) would dangle
+        strength = world.node_tree.nodes.get(self.ENV_STRENGTH_NODE) if world.use_nodes else None
+        if strength is None:
+            strength = self._create_gradient_environment(world)
+        
+        # Set reduced environment strength with fill light support, jittered per sample
+        strength.outputs[0].default_value = params['env_strength']
+        
+        logger.debug("Environment lighting setup complete")
+
+    def _create_gradient_environment(self, world) -> bpy.types.ShaderNode:
+        """
+        Build the gradient world node tree once for even lighting.
+        
+        Returns:
+            Value node driving the background strength - the only per-sample input
+        """
+        
         # Enable nodes
         world.use_nodes = True
         
         # Clear existing nodes
         world.node_tree.nodes.clear()
         
-        # Add environment texture node
-        env_texture = world.node_tree.nodes.new(type='ShaderNodeTexEnvironment')
-        env_texture.location = (-300, 0)
-        
         # Add background shader
         background = world.node_tree.nodes.new(type='ShaderNodeBackground')
         background.location = (0, 0)
         
+        # Add value node feeding the background strength
+        strength = world.node_tree.nodes.new(type='ShaderNodeValue')
+        strength.name = self.ENV_STRENGTH_NODE
+        strength.location = (-150, -200)
+        
         # Add world output
         output = world.node_tree.nodes.new(type='ShaderNodeOutputWorld')
         output.location = (300, 0)
         
-        # Connect nodes
-        world.node_tree.links.new(env_texture.outputs['Color'], background.inputs['Color'])
-        world.node_tree.links.new(background.outputs['Background'], output.inputs['Surface'])
-        
-        # Set reduced environment strength with fill light support
-        background.inputs['Strength'].default_value = 0.25  # Reduced from 0.8 to support fill light
-        
-        # Create a simple gradient environment if no HDRI available
-        self._create_gradient_environment(world, env_texture)
-        
-        logger.debug("Environment lighting setup complete")
-
-    def _create_gradient_environment(self, world, env_texture) -> None:
-        """Create a simple gradient environment for even lighting."""
-        
         # Add color ramp for gradient
         color_ramp = world.node_tree.nodes.new(type='ShaderNodeValToRGB')
         color_ramp.location = (-150, 0)
         
+        # Set moderate gradient colors to support fill light as primary illumination
+        color_ramp.color_ramp.elements[0].color = (0.7, 0.7, 0.7, 1.0)  # Moderate bright top
+        color_ramp.color_ramp.elements[1].color = (0.4, 0.4, 0.4, 1.0)  # Medium bright bottom
+        
         # Add texture coordinate node
         tex_coord = world.node_tree.nodes.new(type='ShaderNodeTexCoord')
         tex_coord.location = (-600, 0)
@@ -378,27 +593,22 @@ class LightingCameraController:
         # Connect gradient nodes
         world.node_tree.links.new(tex_coord.outputs['Generated'], mapping.inputs['Vector'])
         world.node_tree.links.new(mapping.outputs['Vector'], color_ramp.inputs['Fac'])
-        world.node_tree.links.new(color_ramp.outputs['Color'], world.node_tree.nodes['Background'].inputs['Color'])
-        
-        # Set moderate gradient colors to support fill light as primary illumination
-        color_ramp.color_ramp.elements[0].color = (0.7, 0.7, 0.7, 1.0)  # Moderate bright top
-        color_ramp.color_ramp.elements[1].color = (0.4, 0.4, 0.4, 1.0)  # Medium bright bottom
+        world.node_tree.links.new(color_ramp.outputs['Color'], background.inputs['Color'])
+        world.node_tree.links.new(strength.outputs['Value'], background.inputs['Strength'])
+        world.node_tree.links.new(background.outputs['Background'], output.inputs['Surface'])
         
-        # Remove the environment texture node as we're using gradient
-        world.node_tree.nodes.remove(env_texture)
+        return strength
 
     def _create_ambient_light(self) -> bpy.types.Object:
         """
-        Create ambient light for even overall illumination.
+        Update the ambient light for even overall illumination.
         
         Returns:
             Ambient light object
         """
         
-        # Create large area light for ambient illumination
-        bpy.ops.object.light_add(type='AREA')
-        ambient_light = bpy.context.active_object
-        ambient_light.name = "AmbientLight"
+        # Reuse the rig large area light for ambient illumination
+        ambient_light = self._rig_object('ambient')
         
         # Set moderate ambient light energy for visibility without hotspots
         ambient_light.data.energy = 80   # Increased from 20 for better visibility
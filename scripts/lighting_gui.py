@@ -8,9 +8,16 @@ Minimal GUI to control lighting settings without modifying existing code.
 import tkinter as tk
 from tkinter import ttk, messagebox
 import subprocess
-import tempfile
+import threading
+import traceback
+import json
 import os
 
+# Blender process serving render requests for the whole GUI session
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "worker_loop.py")
+DONE_SENTINEL = "###DONE###"  # Must match worker_loop.DONE_SENTINEL
+REQUEST_TIMEOUT = 30  # Seconds before a hung worker is killed and restarted on the next click
+
 class LightingGUI:
     def __init__(self, root):
         self.root = root
@@ -26,7 +33,19 @@ class LightingGUI:
         self.fill_intensity = tk.DoubleVar(value=150)
         self.rim_intensity = tk.DoubleVar(value=200)
         
+        # Pending after() ids of the debounced value label updates
+        self._pending = {}
+        
         self.setup_ui()
+        
+        # Start Blender once so every click reuses its warm scene and render kernels
+        self.worker = None
+        self.busy = False  # A render request is in flight on the reader thread
+        try:
+            self._start_worker()
+        except OSError as e:
+            self.status_var.set(f"❌ Could not start Blender: {str(e)[:30]}...")
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
     
     def setup_ui(self):
         # Main frame
@@ -36,7 +55,7 @@ class LightingGUI:
         # Environment lighting
         ttk.Label(main_frame, text="Environment Light Strength:").grid(row=0, column=0, sticky=tk.W, pady=2)
         ttk.Scale(main_frame, from_=0.1, to=2.0, variable=self.env_strength, orient=tk.HORIZONTAL, length=200).grid(row=0, column=1, pady=2)
-        ttk.Label(main_frame, textvariable=self.env_strength).grid(row=0, column=2, pady=2)
+        self._value_label(main_frame, 'env', self.env_strength, "{:.2f}").grid(row=0, column=2, pady=2)
         
         # Directional lights
         ttk.Separator(main_frame, orient=tk.HORIZONTAL).grid(row=1, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(10, 5))
@@ -45,17 +64,17 @@ class LightingGUI:
         # Key light
         ttk.Checkbutton(main_frame, text="Key Light", variable=self.key_light).grid(row=3, column=0, sticky=tk.W, pady=2)
         ttk.Scale(main_frame, from_=50, to=800, variable=self.key_intensity, orient=tk.HORIZONTAL, length=150).grid(row=3, column=1, pady=2)
-        ttk.Label(main_frame, textvariable=self.key_intensity).grid(row=3, column=2, pady=2)
+        self._value_label(main_frame, 'key', self.key_intensity, "{:.0f}").grid(row=3, column=2, pady=2)
         
         # Fill light
         ttk.Checkbutton(main_frame, text="Fill Light", variable=self.fill_light).grid(row=4, column=0, sticky=tk.W, pady=2)
         ttk.Scale(main_frame, from_=20, to=400, variable=self.fill_intensity, orient=tk.HORIZONTAL, length=150).grid(row=4, column=1, pady=2)
-        ttk.Label(main_frame, textvariable=self.fill_intensity).grid(row=4, column=2, pady=2)
+        self._value_label(main_frame, 'fill', self.fill_intensity, "{:.0f}").grid(row=4, column=2, pady=2)
         
         # Rim light
         ttk.Checkbutton(main_frame, text="Rim Light", variable=self.rim_light).grid(row=5, column=0, sticky=tk.W, pady=2)
         ttk.Scale(main_frame, from_=30, to=600, variable=self.rim_intensity, orient=tk.HORIZONTAL, length=150).grid(row=5, column=1, pady=2)
-        ttk.Label(main_frame, textvariable=self.rim_intensity).grid(row=5, column=2, pady=2)
+        self._value_label(main_frame, 'rim', self.rim_intensity, "{:.0f}").grid(row=5, column=2, pady=2)
         
         # Buttons
         ttk.Separator(main_frame, orient=tk.HORIZONTAL).grid(row=6, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(10, 5))
@@ -69,6 +88,23 @@ class LightingGUI:
         self.status_var = tk.StringVar(value="Ready")
         ttk.Label(main_frame, textvariable=self.status_var, foreground="blue").grid(row=8, column=0, columnspan=3, pady=5)
     
+    def _value_label(self, parent, name, var, fmt, delay_ms=30):
+        """Label showing var's value, redrawn at most once per delay_ms while a slider drags"""
+        label = ttk.Label(parent, text=fmt.format(var.get()))
+        
+        def schedule(*_):
+            pending = self._pending.pop(name, None)
+            if pending is not None:
+                self.root.after_cancel(pending)
+            self._pending[name] = self.root.after(delay_ms, update)
+        
+        def update():
+            self._pending.pop(name, None)
+            label.configure(text=fmt.format(var.get()))
+        
+        var.trace_add('write', schedule)
+        return label
+    
     def generate_custom_script(self):
         """Generate temporary custom lighting script"""
         script_content = f'''
@@ -85,15 +121,14 @@ from mathutils import Vector
 class CustomLightingController(LightingCameraController):
     def setup_lighting(self):
         """Custom lighting setup from GUI"""
-        self._clear_existing_lights()
         self._setup_custom_environment({self.env_strength.get()})
         
-        if {self.key_light.get()}:
-            self._create_custom_key_light({self.key_intensity.get()})
-        if {self.fill_light.get()}:
-            self._create_custom_fill_light({self.fill_intensity.get()})
-        if {self.rim_light.get()}:
-            self._create_custom_rim_light({self.rim_intensity.get()})
+        # Lights are created once; disabled ones keep zero energy instead of being removed
+        self._custom_light("CustomKeyLight", 'SUN', (3, 3, 5)).data.energy = {self.key_intensity.get() if self.key_light.get() else 0.0}
+        fill_light = self._custom_light("CustomFillLight", 'AREA', (-2, 1, 4))
+        fill_light.data.energy = {self.fill_intensity.get() if self.fill_light.get() else 0.0}
+        fill_light.data.size = 3.0
+        self._custom_light("CustomRimLight", 'SPOT', (-3, -3, 4)).data.energy = {self.rim_intensity.get() if self.rim_light.get() else 0.0}
     
     def _setup_custom_environment(self, strength):
         """Setup environment with custom strength"""
@@ -114,27 +149,14 @@ class CustomLightingController(LightingCameraController):
         output.location = (300, 0)
         world.node_tree.links.new(background.outputs['Background'], output.inputs['Surface'])
     
-    def _create_custom_key_light(self, intensity):
-        bpy.ops.object.light_add(type='SUN')
-        light = bpy.context.active_object
-        light.name = "CustomKeyLight"
-        light.data.energy = intensity
-        light.location = (3, 3, 5)
-    
-    def _create_custom_fill_light(self, intensity):
-        bpy.ops.object.light_add(type='AREA')
-        light = bpy.context.active_object
-        light.name = "CustomFillLight"
-        light.data.energy = intensity
-        light.data.size = 3.0
-        light.location = (-2, 1, 4)
-    
-    def _create_custom_rim_light(self, intensity):
-        bpy.ops.object.light_add(type='SPOT')
-        light = bpy.context.active_object
-        light.name = "CustomRimLight"
-        light.data.energy = intensity
-        light.location = (-3, -3, 4)
+    def _custom_light(self, name, light_type, location):
+        """Return the named light, adding it on first use"""
+        light = bpy.data.objects.get(name)
+        if light is None:
+            light = bpy.data.objects.new(name, bpy.data.lights.new(name, light_type))
+            bpy.context.collection.objects.link(light)
+            light.location = location
+        return light
 
 # Replace the original controller
 controller = CustomLightingController()
@@ -143,218 +165,117 @@ controller.setup_camera()
 '''
         return script_content
     
-    def generate_test(self):
-        """Generate a test image with current settings"""
-        self.status_var.set("Generating test image...")
-        self.root.update()
+    def _start_worker(self):
+        """Launch the persistent Blender worker unless it is already running"""
+        if self.worker is not None and self.worker.poll() is None:
+            return self.worker
+        
+        cmd = ['blender', '--background', '--python', WORKER_SCRIPT]
+        self.worker = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                       stderr=subprocess.STDOUT, text=True, bufsize=1)
+        return self.worker
+    
+    def _send_request(self, request, on_output=None):
+        """Send one request to the worker and return its status reply"""
+        worker = self._start_worker()
+        worker.stdin.write(json.dumps(request) + "\n")
+        worker.stdin.flush()
+        
+        # Killing the worker closes its stdout, which ends the blocking readline below
+        timed_out = threading.Event()
+        def kill_worker():
+            timed_out.set()
+            worker.kill()
+        timer = threading.Timer(REQUEST_TIMEOUT, kill_worker)
+        timer.daemon = True
+        timer.start()
         
         try:
-            # Create a simple Blender script
-            script_content = f'''
-import bpy
-import sys
-import os
-
-# Add project path
-project_path = "{os.path.dirname(os.path.dirname(os.path.abspath(__file__)))}"
-sys.path.append(os.path.join(project_path, "scripts"))
-
-# Import modules
-from cylinder_generator import CylinderGenerator
-from text_embosser import TextEmbosser
-
-# Clear scene
-bpy.ops.object.select_all(action='SELECT')
-bpy.ops.object.delete(use_global=False)
-
-# Create cylinder and text
-cylinder_gen = CylinderGenerator()
-cylinder = cylinder_gen.create_cylinder(size_type='medium')
-
-# Create text embosser with correct parameters
-text_embosser = TextEmbosser(font_dir=os.path.join(project_path, "fonts"), font_style="default")
-text_embosser.apply_debossed_text(cylinder, "GUI-TEST")
-
-# Setup custom lighting
-world = bpy.context.scene.world
-if not world:
-    world = bpy.data.worlds.new("World")
-    bpy.context.scene.world = world
-
-world.use_nodes = True
-world.node_tree.nodes.clear()
-
-background = world.node_tree.nodes.new(type='ShaderNodeBackground')
-background.inputs['Strength'].default_value = {self.env_strength.get()}
-background.inputs['Color'].default_value = (0.9, 0.9, 0.9, 1.0)  # Brighter background
-
-output = world.node_tree.nodes.new(type='ShaderNodeOutputWorld')
-world.node_tree.links.new(background.outputs['Background'], output.inputs['Surface'])
-
-# Clear existing lights first
-for obj in bpy.data.objects:
-    if obj.type == 'LIGHT':
-        bpy.data.objects.remove(obj, do_unlink=True)
-
-# Add directional lights if enabled
-if {self.key_light.get()}:
-    bpy.ops.object.light_add(type='SUN', location=(5, 5, 8))
-    light = bpy.context.active_object
-    light.name = "GUIKeyLight"
-    light.data.energy = {self.key_intensity.get()}
-    light.rotation_euler = (0.7, 0, 0.78)  # Point toward cylinder
-    print(f"Added Key Light with energy: {{light.data.energy}}")
-
-if {self.fill_light.get()}:
-    bpy.ops.object.light_add(type='AREA', location=(-3, 2, 6))
-    light = bpy.context.active_object
-    light.name = "GUIFillLight"
-    light.data.energy = {self.fill_intensity.get()}
-    light.data.size = 4.0
-    light.rotation_euler = (0.5, 0, -0.5)  # Point toward cylinder
-    print(f"Added Fill Light with energy: {{light.data.energy}}")
-
-if {self.rim_light.get()}:
-    bpy.ops.object.light_add(type='SPOT', location=(-4, -4, 6))
-    light = bpy.context.active_object
-    light.name = "GUIRimLight"  
-    light.data.energy = {self.rim_intensity.get()}
-    light.rotation_euler = (0.6, 0, -2.3)  # Point toward cylinder
-    print(f"Added Rim Light with energy: {{light.data.energy}}")
-
-# Add basic lighting if no directional lights are enabled
-if not ({self.key_light.get()} or {self.fill_light.get()} or {self.rim_light.get()}):
-    bpy.ops.object.light_add(type='SUN', location=(3, 3, 6))
-    light = bpy.context.active_object
-    light.name = "DefaultLight"
-    light.data.energy = 2.0
-    light.rotation_euler = (0.7, 0, 0.78)
-    print("Added default sun light for visibility")
-
-# Debug: Print object info
-print("Objects in scene:")
-for obj in bpy.data.objects:
-    print(f"  - {{obj.name}} ({{obj.type}}) at {{obj.location}}")
-    if obj.type == 'MESH':
-        print(f"    Dimensions: {{obj.dimensions}}")
-        print(f"    Material: {{obj.data.materials[:] if obj.data.materials else 'None'}}")
-
-# Get camera reference for debug info
-scene_camera = bpy.context.scene.camera
-if scene_camera:
-    print(f"Camera location: {{scene_camera.location}}")
-    print(f"Camera rotation: {{scene_camera.rotation_euler}}")
-else:
-    print("No camera found in scene")
-
-print(f"Environment strength: {self.env_strength.get()}")
-
-# Setup camera with proper positioning
-if bpy.context.scene.camera:
-    bpy.data.objects.remove(bpy.context.scene.camera, do_unlink=True)
-
-bpy.ops.object.camera_add()
-camera = bpy.context.active_object
-bpy.context.scene.camera = camera
-
-# Position camera to look at cylinder center
-camera.location = (4, 4, 3)  # Distance from cylinder
-# Point camera at cylinder (which is at origin with height 1.5 center)
-import mathutils
-direction = mathutils.Vector((0, 0, 1.5)) - camera.location
-camera.rotation_euler = direction.to_track_quat('-Z', 'Y').to_euler()
-
-# Set camera properties
-camera.data.lens = 50  # 50mm lens
-
-# Render settings
-scene = bpy.context.scene
-scene.render.resolution_x = 512
-scene.render.resolution_y = 256
-scene.render.filepath = os.path.join(project_path, "output", "images", "gui_test.png")
-
-# Set render engine and samples for faster preview
-scene.render.engine = 'CYCLES'
-scene.cycles.samples = 32  # Reduced for faster GUI testing
-
-# Ensure proper viewport settings
-for area in bpy.context.screen.areas:
-    if area.type == 'VIEW_3D':
-        for space in area.spaces:
-            if space.type == 'VIEW_3D':
-                space.shading.type = 'MATERIAL'
-
-# Frame the cylinder in camera view - manual positioning since camera_to_view_selected doesn't work in background
-cylinder_obj = None
-for obj in bpy.data.objects:
-    if obj.type == 'MESH' and 'Cylinder' in obj.name:
-        cylinder_obj = obj
-        break
-
-if cylinder_obj:
-    # Calculate camera position to frame the cylinder properly
-    cylinder_center = cylinder_obj.location
-    cylinder_size = max(cylinder_obj.dimensions)
+            # Everything before the sentinel is Blender/worker log output
+            for line in iter(worker.stdout.readline, ''):
+                if line.startswith(DONE_SENTINEL):
+                    return json.loads(line[len(DONE_SENTINEL):])
+                print(line, end="")
+                if on_output is not None:
+                    on_output(line.strip())
+        finally:
+            timer.cancel()
+        
+        if timed_out.is_set():
+            worker.wait()
+            self.worker = None  # The next request starts a fresh worker
+            raise TimeoutError(f"No reply from the Blender worker within {REQUEST_TIMEOUT}s")
+        raise RuntimeError(f"Blender worker exited with code {worker.wait()}")
     
-    # Position camera at optimal distance
-    distance = cylinder_size * 2.5  # 2.5x the object size
-    camera_loc = (distance * 0.7, distance * 0.7, cylinder_center.z + distance * 0.3)
+    def _lighting_params(self):
+        """Current GUI settings as plain values for the worker"""
+        return {
+            'env_strength': self.env_strength.get(),
+            'key_light': self.key_light.get(),
+            'fill_light': self.fill_light.get(),
+            'rim_light': self.rim_light.get(),
+            'key_intensity': self.key_intensity.get(),
+            'fill_intensity': self.fill_intensity.get(),
+            'rim_intensity': self.rim_intensity.get(),
+        }
     
-    scene_camera = bpy.context.scene.camera
-    if scene_camera:
-        scene_camera.location = camera_loc
+    def generate_test(self):
+        """Generate a test image with current settings"""
+        if self.busy:
+            self.status_var.set("⏳ Still rendering the previous test image...")
+            return
         
-        # Point camera at cylinder center
-        import mathutils
-        direction = cylinder_center - mathutils.Vector(camera_loc)
-        scene_camera.rotation_euler = direction.to_track_quat('-Z', 'Y').to_euler()
+        self.busy = True
+        self.status_var.set("Generating test image...")
         
-        print(f"Positioned camera at {{camera_loc}} looking at {{cylinder_center}}")
-    else:
-        print("No camera found to position")
-else:
-    print("No cylinder found to frame")
-
-# Render
-print("Starting render...")
-bpy.ops.render.render(write_still=True)
-print("✅ GUI test image saved to output/images/gui_test.png")
-'''
-            
-            # Write to temporary file
-            import tempfile
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-                f.write(script_content)
-                temp_script = f.name
-            
-            # Run Blender
-            import subprocess
-            cmd = ['blender', '--background', '--python', temp_script]
-            
-            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-            try:
-                stdout, stderr = process.communicate(timeout=30)
-                
-                # Cleanup
-                os.unlink(temp_script)
-                
-                if process.returncode == 0 and "GUI test image saved" in stdout:
-                    self.status_var.set("✅ Test image generated successfully!")
-                else:
-                    self.status_var.set("❌ Generation failed")
-                    print(f"STDOUT: {stdout}")
-                    print(f"STDERR: {stderr}")
-                    
-            except subprocess.TimeoutExpired:
-                process.kill()
-                self.status_var.set("❌ Generation timed out")
-                os.unlink(temp_script)
-                
+        # Tk variables are read here on the main thread; the reader thread only sees plain values
+        request = {'cmd': 'render', 'params': self._lighting_params()}
+        threading.Thread(target=self._run_request, args=(request,), daemon=True).start()
+    
+    def _run_request(self, request):
+        """Wait for the worker off the Tk thread and hand results back via root.after"""
+        try:
+            status = self._send_request(
+                request, on_output=lambda line: self.root.after(0, self._on_render_progress, line))
+        except TimeoutError as e:
+            print(e)
+            status = {'ok': False, 'timeout': True}
         except Exception as e:
-            self.status_var.set(f"❌ Error: {str(e)[:30]}...")
             print(f"Exception: {e}")
-            import traceback
             traceback.print_exc()
+            status = {'ok': False, 'error': str(e), 'exception': True}
+        
+        self.root.after(0, self._on_render_done, status)
+    
+    def _on_render_progress(self, line):
+        """Show the latest worker log line while rendering"""
+        if self.busy and line:
+            self.status_var.set(line[:50])
+    
+    def _on_render_done(self, status):
+        """Report the finished request on the Tk thread"""
+        self.busy = False
+        
+        if status.get('ok'):
+            self.status_var.set("✅ Test image generated successfully!")
+        elif status.get('timeout'):
+            self.status_var.set("❌ Generation timed out")
+        elif status.get('exception'):
+            self.status_var.set(f"❌ Error: {status.get('error', '')[:30]}...")
+        else:
+            self.status_var.set("❌ Generation failed")
+            print(f"Worker error: {status.get('error')}")
+    
+    def on_close(self):
+        """Stop the Blender worker and close the window"""
+        if self.worker is not None and self.worker.poll() is None:
+            try:
+                self.worker.stdin.write(json.dumps({'cmd': 'quit'}) + "\n")
+                self.worker.stdin.flush()
+                self.worker.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                self.worker.kill()
+        self.root.destroy()
     
     def reset_defaults(self):
         """Reset to default values"""
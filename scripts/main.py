@@ -19,6 +19,8 @@ import random
 import logging
 from pathlib import Path
 
+import numpy as np
+
 # Add the scripts directory to Python path for imports
 script_dir = Path(__file__).parent
 sys.path.append(str(script_dir))
@@ -30,10 +32,11 @@ except ImportError:
     print("Usage: blender --background --python scripts/main.py -- [arguments]")
     sys.exit(1)
 
-from cylinder_generator import CylinderGenerator
+from cylinder_generator import CylinderGenerator, load_template, save_template
 from text_embosser import TextEmbosser
 from lighting_camera import LightingCameraController
-from utils import setup_logging, load_text_dictionary, create_output_dirs
+from utils import (setup_logging, load_text_dictionary, create_output_dirs, undo_disabled,
+                   AsyncFileWriter, enable_gpu_devices)
 
 
 def parse_arguments():
@@ -100,11 +103,284 @@ def parse_arguments():
         help="Font style preference (default: industrial)"
     )
     
+    parser.add_argument(
+        "--font-family",
+        type=str,
+        default=None,
+        help="Stamp only with fonts of this family name, e.g. FreesiaUPC (needs fontTools)"
+    )
+    
+    parser.add_argument(
+        "--png-compression",
+        type=int,
+        default=10,
+        help="PNG compression 0-100; lower encodes faster, files stay lossless (default: 10)"
+    )
+    
+    parser.add_argument(
+        "--label-format",
+        type=str,
+        choices=['files', 'tsv'],
+        default='files',
+        help="Ground truth as one .txt per image or a single labels/labels.tsv manifest (default: files)"
+    )
+    
+    parser.add_argument(
+        "--template",
+        type=str,
+        default=None,
+        help="Cylinder template .blend; loaded if it exists, otherwise built and saved there"
+    )
+    
+    parser.add_argument(
+        "--high-quality-lighting",
+        action="store_true",
+        help="Add key, rim and ambient lights on top of the single fill light (slower)"
+    )
+    
+    parser.add_argument(
+        "--text-mode",
+        choices=["boolean", "bump"],
+        default="boolean",
+        help="Deboss text with a boolean cut, or as a bump-mapped decal without "
+             "geometry (much faster, needs Pillow 10.1+ in Blender's Python) (default: boolean)"
+    )
+    
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=1,
+        help="Split the run across this many processes, see render_shards.py (default: 1)"
+    )
+    
+    parser.add_argument(
+        "--shard-index",
+        type=int,
+        default=0,
+        help="Which shard this process renders, 0 <= index < shards (default: 0)"
+    )
+    
     # Parse arguments that come after '--' in Blender command
     args = parser.parse_args(sys.argv[sys.argv.index("--") + 1:])
+    
+    if args.shards < 1 or not 0 <= args.shard_index < args.shards:
+        parser.error("--shard-index must be in [0, --shards)")
+    if args.shards > 1 and args.seed is None:
+        # Shards stride over one text plan, which only a shared seed makes identical
+        parser.error("--seed is required when --shards > 1")
+    
     return args
 
 
+class RenderBatch:
+    """Generation state for one run; each step renders one image and its label."""
+    
+    def __init__(self, args, text_list, cylinder_gen, text_embosser, lighting_camera):
+        """
+        Initialize the batch state.
+        
+        Args:
+            args: Parsed command line arguments
+            text_list: Text strings to draw the render plan from
+            cylinder_gen: Cylinder generator
+            text_embosser: Text embosser
+            lighting_camera: Lighting and camera controller
+        """
+        
+        self.args = args
+        self.text_list = text_list
+        self.cylinder_gen = cylinder_gen
+        self.text_embosser = text_embosser
+        self.lighting_camera = lighting_camera
+        self.rig_objects = lighting_camera.rig_objects()
+        
+        # Draw every text up front and render similar strings back to back, so
+        # consecutive images reuse the same glyphs and cutter sizes
+        picks = np.random.default_rng(args.seed).integers(0, len(text_list), size=args.count)
+        plan = sorted((text_list[pick] for pick in picks), key=lambda text: (len(text), text[:2]))
+        
+        # Each shard renders every shards-th entry; numbering stays global, so
+        # shards write disjoint file names
+        indices = range(args.shard_index, args.count, args.shards)
+        self.plan = [plan[i] for i in indices]
+        
+        # Output paths for the whole plan, built once
+        image_dir = os.path.join(args.output, 'images')
+        label_dir = os.path.join(args.output, 'labels')
+        stems = [f"{plan[i]}_{i+1:03d}" for i in indices]
+        self.image_paths = [os.path.join(image_dir, f"{stem}.png") for stem in stems]
+        self.label_paths = [os.path.join(label_dir, f"{stem}.txt") for stem in stems]
+        
+        self.iter = 0
+        self.generated_count = 0
+        self.cylinder = None
+        
+        # Labels are written off the main thread while the next image is set up,
+        # or appended to one buffered manifest
+        self.writer = AsyncFileWriter()
+        self.manifest = None
+        if args.label_format == 'tsv':
+            manifest_name = 'labels.tsv' if args.shards == 1 else f"labels_{args.shard_index:02d}.tsv"
+            self.manifest = open(os.path.join(label_dir, manifest_name), 'w', buffering=1 << 16, encoding='utf-8')
+    
+    def step(self) -> bool:
+        """
+        Generate and render the next image.
+        
+        Returns:
+            True while images remain to be generated
+        """
+        
+        logger = logging.getLogger(__name__)
+        args = self.args
+        scene = bpy.context.scene
+        
+        if self.iter >= len(self.plan):
+            return False
+        
+        text_content = self.plan[self.iter]
+        image_path = self.image_paths[self.iter]
+        label_path = self.label_paths[self.iter]
+        
+        logger.debug("Generating image %d/%d: %s", self.iter + 1, len(self.plan), text_content)
+        
+        # Recycle the previous cylinder, then clear the rest of the scene
+        # except the persistent camera/light rig and text cutter
+        if self.cylinder is not None:
+            self.cylinder_gen.release_cylinder(self.cylinder)
+        keep_objects = set(self.rig_objects + self.text_embosser.live_objects())
+        for obj in list(scene.collection.all_objects):
+            if obj not in keep_objects:
+                bpy.data.objects.remove(obj, do_unlink=True)
+        
+        # Setup lighting and camera first; they do not depend on the cylinder
+        self.lighting_camera.randomize_scene()
+        
+        # Generate cylinder, tessellated for its size in this camera's view. The
+        # deboss stays a live modifier, so the cached mesh is used without a copy
+        self.cylinder = self.cylinder_gen.create_cylinder(camera=scene.camera, shared=True)
+        
+        if args.text_mode == 'bump':
+            # Stamp the text into the material's bump only - no boolean at all
+            self.text_embosser.apply_displacement_text(self.cylinder, text_content)
+        else:
+            # Apply text debossing by swapping the text of the persistent cutter
+            self.text_embosser.deboss_live(self.cylinder, text_content)
+        
+        # Render image
+        scene.render.filepath = image_path
+        
+        # Scene assembly only wrote data; evaluate the depsgraph once for the render
+        bpy.context.view_layer.update()
+        bpy.ops.render.render(write_still=True)
+        
+        # Write ground truth label
+        if self.manifest is not None:
+            self.manifest.write(f"{os.path.basename(image_path)}\t{text_content}\n")
+        else:
+            self.writer.write_text(label_path, text_content)
+        
+        self.iter += 1
+        self.generated_count += 1
+        
+        if self.generated_count % 10 == 0:
+            logger.info("Progress: %d/%d images generated", self.generated_count, len(self.plan))
+        
+        return self.iter < len(self.plan)
+    
+    def finish(self) -> None:
+        """Flush the pending label writes, then log how many images were written and where."""
+        
+        try:
+            self.writer.close()
+        finally:
+            # Labels already in the manifest are kept even if a queued write failed
+            if self.manifest is not None:
+                self.manifest.close()
+        
+        logger = logging.getLogger(__name__)
+        logger.info(f"Generation complete! Generated {self.generated_count} images")
+        logger.info(f"Images saved to: {os.path.join(self.args.output, 'images')}")
+        logger.info(f"Labels saved to: {os.path.join(self.args.output, 'labels')}")
+
+
+class RenderBatchOperator(bpy.types.Operator):
+    """Render the dataset one image per timer event so Blender's event loop keeps running"""
+    
+    bl_idname = "wm.render_batch"
+    bl_label = "Render Gas Tank Batch"
+    
+    # Set by main() before the operator is called; operator properties cannot hold Python objects
+    batch = None
+    
+    def execute(self, context):
+        """Render the whole batch in one call (used when there is no window)."""
+        
+        # Labels of the images rendered so far are flushed however the loop ends
+        try:
+            with undo_disabled():
+                while self.batch.step():
+                    pass
+        except KeyboardInterrupt:
+            logging.getLogger(__name__).warning("Generation interrupted by user")
+            return {'CANCELLED'}
+        finally:
+            self.batch.finish()
+        return {'FINISHED'}
+    
+    def invoke(self, context, event):
+        """Start the timer that drives one render per event."""
+        
+        # Background mode has no window and no event loop to come back to
+        if context.window is None:
+            return self.execute(context)
+        
+        # Undo stays off for every timer step until _finish() restores it
+        self._undo = undo_disabled()
+        self._undo.__enter__()
+        
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(0.0, window=context.window)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+    
+    def modal(self, context, event):
+        """Render the next image on each timer event; ESC stops the batch."""
+        
+        if event.type == 'ESC':
+            logging.getLogger(__name__).warning("Generation interrupted by user")
+            return self._finish(context, {'CANCELLED'})
+        
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+        
+        try:
+            more = self.batch.step()
+        except Exception as e:
+            logging.getLogger(__name__).error(f"Error during generation: {str(e)}")
+            self._finish(context, {'CANCELLED'})
+            raise
+        
+        if not more:
+            return self._finish(context, {'FINISHED'})
+        return {'RUNNING_MODAL'}
+    
+    def cancel(self, context):
+        """Clean up when Blender cancels the modal operator, e.g. when the window closes."""
+        
+        self._finish(context, {'CANCELLED'})
+    
+    def _finish(self, context, result):
+        """Remove the timer, finish the batch, restore undo and return the given result."""
+        
+        try:
+            context.window_manager.event_timer_remove(self._timer)
+            self.batch.finish()
+        finally:
+            self._undo.__exit__(None, None, None)
+        return result
+
+
 def main():
     """Main execution function."""
     
@@ -118,10 +394,13 @@ def main():
     logger.info(f"Starting Gas Tank Text Image Generation")
     logger.info(f"Parameters: count={args.count}, dict={args.dict}, output={args.output}")
     
-    # Set random seed if provided
+    # Set random seed if provided; shards share the text plan but not the scene randomness
+    shard_seed = args.seed + args.shard_index if args.seed is not None else None
     if args.seed is not None:
-        random.seed(args.seed)
-        logger.info(f"Random seed set to: {args.seed}")
+        random.seed(shard_seed)
+        logger.info(f"Random seed set to: {shard_seed}")
+    if args.shards > 1:
+        logger.info(f"Rendering shard {args.shard_index + 1}/{args.shards}")
     
     # Validate input files
     if not os.path.exists(args.dict):
@@ -137,8 +416,21 @@ def main():
     
     # Initialize generators
     cylinder_gen = CylinderGenerator()
-    text_embosser = TextEmbosser(args.font_dir, args.font_style)
-    lighting_camera = LightingCameraController()
+    if args.template:
+        # Meshes, materials and the baked bump map come from the template when available
+        if os.path.exists(args.template):
+            load_template(args.template)
+        else:
+            cylinder_gen.prebuild()
+            save_template(args.template)
+    # Fonts only need the glyphs that occur in the dictionary
+    charset = ''.join(sorted(set(''.join(text_list))))
+    text_embosser = TextEmbosser(args.font_dir, args.font_style, seed=shard_seed, charset=charset,
+                                  font_family=args.font_family)
+    lighting_camera = LightingCameraController(high_quality=args.high_quality_lighting, seed=shard_seed)
+    
+    # All camera/light poses for this shard in one vectorized pass
+    lighting_camera.presample_poses(len(range(args.shard_index, args.count, args.shards)))
     
     # Setup Blender rendering
     scene = bpy.context.scene
@@ -146,61 +438,29 @@ def main():
     scene.render.resolution_y = args.resolution[1]
     scene.render.engine = 'CYCLES'
     scene.cycles.samples = args.samples
+    
+    # Keep synced geometry, BVH and textures on the device between images
+    scene.render.use_persistent_data = True
+    device_type = enable_gpu_devices()
+    if device_type:
+        scene.cycles.device = 'GPU'
+        logger.info(f"Rendering on GPU ({device_type})")
+    else:
+        logger.info("No supported GPU found, rendering on CPU")
     scene.render.image_settings.file_format = 'PNG'
+    scene.render.image_settings.compression = args.png_compression  # ~zlib level 1 at the default
     scene.render.filepath = os.path.join(args.output, 'images', 'temp.png')
     
-    # Generate images
-    generated_count = 0
+    # Generate images through the batch operator
+    bpy.utils.register_class(RenderBatchOperator)
+    RenderBatchOperator.batch = RenderBatch(args, text_list, cylinder_gen, text_embosser, lighting_camera)
     
+    # The operator disables undo itself for as long as the batch runs
     try:
-        for i in range(args.count):
-            # Select random text from dictionary
-            text_content = random.choice(text_list)
-            variant_id = f"{i+1:03d}"
-            
-            logger.info(f"Generating image {i+1}/{args.count}: {text_content}")
-            
-            # Clear scene
-            bpy.ops.object.select_all(action='SELECT')
-            bpy.ops.object.delete(use_global=False)
-            
-            # Generate cylinder
-            cylinder = cylinder_gen.create_cylinder()
-            
-            # Apply text debossing
-            text_embosser.apply_debossed_text(cylinder, text_content)
-            
-            # Setup lighting and camera
-            lighting_camera.randomize_scene()
-            
-            # Render image
-            image_filename = f"{text_content}_{variant_id}.png"
-            label_filename = f"{text_content}_{variant_id}.txt"
-            
-            image_path = os.path.join(args.output, 'images', image_filename)
-            label_path = os.path.join(args.output, 'labels', label_filename)
-            
-            scene.render.filepath = image_path
-            bpy.ops.render.render(write_still=True)
-            
-            # Write ground truth label
-            with open(label_path, 'w', encoding='utf-8') as f:
-                f.write(text_content)
-            
-            generated_count += 1
-            
-            if generated_count % 10 == 0:
-                logger.info(f"Progress: {generated_count}/{args.count} images generated")
-    
-    except KeyboardInterrupt:
-        logger.warning("Generation interrupted by user")
+        bpy.ops.wm.render_batch('INVOKE_DEFAULT')
     except Exception as e:
         logger.error(f"Error during generation: {str(e)}")
         raise
-    
-    logger.info(f"Generation complete! Generated {generated_count} images")
-    logger.info(f"Images saved to: {os.path.join(args.output, 'images')}")
-    logger.info(f"Labels saved to: {os.path.join(args.output, 'labels')}")
 
 
 if __name__ == "__main__":
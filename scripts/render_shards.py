@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Sharded Batch Rendering Driver
+
+Launches several headless Blender processes, each rendering a disjoint share of
+the images of one main.py run, and waits for all of them. Blender runs bpy on a
+single thread, so separate processes are the way to keep a GPU (or several)
+busy while each process spends time on scene setup and file output.
+
+Usage:
+    python scripts/render_shards.py --shards 2 -- --count 1000 --dict data/dict.txt --seed 42
+
+Everything after '--' is passed to main.py unchanged; --shards/--shard-index
+are added per process. Each process gets an equal share of the CPU threads, so
+N shards on a CPU render do not oversubscribe the cores. With --label-format tsv
+the per-shard manifests are merged into labels/labels.tsv at the end.
+
+Author: Gas Tank Text Generator Project
+Date: July 2025
+"""
+
+import os
+import sys
+import glob
+import random
+import argparse
+import subprocess
+from pathlib import Path
+
+MAIN_SCRIPT = str(Path(__file__).parent / "main.py")
+
+
+def parse_arguments():
+    """Parse driver arguments; main.py arguments follow '--'."""
+    
+    argv = sys.argv[1:]
+    split = argv.index("--") if "--" in argv else len(argv)
+    
+    parser = argparse.ArgumentParser(
+        description="Render one dataset with several Blender processes"
+    )
+    
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=2,
+        help="Number of Blender processes (default: 2)"
+    )
+    
+    parser.add_argument(
+        "--blender",
+        type=str,
+        default="blender",
+        help="Blender executable (default: blender)"
+    )
+    
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=None,
+        help="CPU threads per Blender process (default: CPU count divided by shards)"
+    )
+    
+    args = parser.parse_args(argv[:split])
+    if args.shards < 1:
+        parser.error("--shards must be at least 1")
+    if args.threads is None:
+        args.threads = max(1, (os.cpu_count() or 1) // args.shards)
+    args.main_args = argv[split + 1:]
+    return args
+
+
+def parse_main_args(main_args):
+    """
+    Read the seed and output options from the arguments passed through to main.py.
+    
+    Args:
+        main_args: Arguments passed through to main.py
+        
+    Returns:
+        Namespace with seed, output and label_format, using main.py's defaults
+    """
+    
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", type=str, default="output/")
+    parser.add_argument("--label-format", type=str, default="files")
+    
+    known, _ = parser.parse_known_args(main_args)
+    return known
+
+
+def merge_manifests(output: str) -> None:
+    """
+    Concatenate the per-shard labels_NN.tsv files into labels.tsv.
+    
+    Args:
+        output: main.py output directory
+    """
+    
+    label_dir = os.path.join(output, "labels")
+    shard_manifests = sorted(glob.glob(os.path.join(label_dir, "labels_[0-9][0-9].tsv")))
+    
+    with open(os.path.join(label_dir, "labels.tsv"), "w", encoding="utf-8") as merged:
+        for path in shard_manifests:
+            with open(path, encoding="utf-8") as shard:
+                merged.write(shard.read())
+            os.remove(path)
+    
+    print(f"Merged {len(shard_manifests)} shard manifests into {label_dir}/labels.tsv")
+
+
+def main():
+    """Start every shard, wait for them and merge their outputs."""
+    
+    args = parse_arguments()
+    main_options = parse_main_args(args.main_args)
+    
+    # Every shard must draw the same text plan, so they all need one seed
+    main_args = list(args.main_args)
+    if main_options.seed is None:
+        seed = random.randrange(2**31)
+        main_args += ["--seed", str(seed)]
+        print(f"No --seed given, using {seed} for all shards")
+    
+    processes = []
+    for shard_index in range(args.shards):
+        # Without --python-exit-code Blender exits 0 even when main.py raises
+        cmd = [args.blender, "--background", "--threads", str(args.threads),
+               "--python-exit-code", "1", "--python", MAIN_SCRIPT, "--",
+               *main_args, "--shards", str(args.shards), "--shard-index", str(shard_index)]
+        print(f"Starting shard {shard_index + 1}/{args.shards} with {args.threads} threads")
+        processes.append(subprocess.Popen(cmd))
+    
+    return_codes = [process.wait() for process in processes]
+    failed = [index for index, code in enumerate(return_codes) if code != 0]
+    
+    if failed:
+        # The per-shard manifests are kept so the finished shards' labels survive
+        print(f"Shards failed: {failed}; labels_NN.tsv files left unmerged")
+        sys.exit(1)
+    
+    if main_options.label_format == "tsv":
+        merge_manifests(main_options.output)
+    
+    print(f"All {args.shards} shards finished")
+
+
+if __name__ == "__main__":
+    main()
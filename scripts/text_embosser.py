@@ -9,41 +9,324 @@ Date: July 2025
 """
 
 import os
-import glob
-import random
+import json
+import zlib
+import math
+import mmap
 import logging
-from typing import List, Optional
+import numpy as np
+from typing import Dict, List, Optional, Tuple
 
 try:
     import bpy
-    from mathutils import Vector
+    import bmesh
+    from mathutils import Vector, Matrix
 except ImportError:
     print("Warning: bpy not available - this module requires Blender")
 
+try:
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:
+    Image = ImageDraw = ImageFont = None  # Only needed by apply_displacement_text()
+
+from utils import undo_disabled, subset_fonts, is_alive
+from cylinder_generator import HEIGHT_PROP, RADIUS_PROP
+
 logger = logging.getLogger(__name__)
 
+FONT_EXTENSIONS = ('.ttf', '.otf', '.woff')
+FONT_STYLE_DIRS = ('industrial', 'monospace', 'default')
+
+# Font file scans by (absolute font_dir, font_style); the fonts directory does not change during a run
+_FONT_SCAN_CACHE = {}
+
+# Subsetted fonts are kept between runs in the project's (gitignored) cache directory
+FONT_SUBSET_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache", "fonts")
+
+# Family names of font files by absolute path, kept between runs as {path: [mtime, family]}
+FONT_INDEX_PATH = os.path.join(os.path.expanduser("~"), ".cache", "gastank_fonts.json")
+
+
+def _scan_font_files(directory: str) -> List[str]:
+    """
+    Recursively list font files below a directory in a single pass.
+    
+    Args:
+        directory: Directory to scan (missing directories yield nothing)
+        
+    Returns:
+        Font file paths in sorted directory order
+    """
+    
+    found = []
+    try:
+        entries = sorted(os.scandir(directory), key=lambda entry: entry.name)
+    except (FileNotFoundError, NotADirectoryError):
+        return found
+    
+    for entry in entries:
+        if entry.name.startswith('.'):
+            continue  # Hidden files and directories, as glob skips them
+        if entry.is_dir():
+            found.extend(_scan_font_files(entry.path))
+        elif entry.name.lower().endswith(FONT_EXTENSIONS):
+            found.append(entry.path)
+    
+    return found
+
+
+def _sniff_font_family(path: str) -> Optional[str]:
+    """
+    Read a font's family name, touching only the tables needed for it.
+    
+    The file is memory-mapped and parsed lazily, so the OS pages in the table
+    directory and the 'name' table instead of the whole file.
+    
+    Args:
+        path: Font file path
+        
+    Returns:
+        Family name, or None if fontTools is missing or the file cannot be read
+    """
+    
+    try:
+        from fontTools.ttLib import TTFont
+    except ImportError:
+        return None
+    
+    try:
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            font = TTFont(mapped, lazy=True)
+            try:
+                return font['name'].getBestFamilyName()
+            finally:
+                font.close()  # Lazy tables reference the mapping, so close before unmapping
+    except Exception as e:
+        logger.debug("Could not read family name of %s: %s", path, e)
+        return None
+
+
+def _font_family_index(font_paths: List[str]) -> Dict[str, List[str]]:
+    """
+    Group font files by family name, sniffing only files not in FONT_INDEX_PATH.
+    
+    Args:
+        font_paths: Font file paths
+        
+    Returns:
+        Dictionary mapping family name to font paths, in the order given
+    """
+    
+    try:
+        with open(FONT_INDEX_PATH, encoding='utf-8') as f:
+            known = json.load(f)
+    except (OSError, ValueError):
+        known = {}
+    
+    families = {}
+    changed = False
+    for font_path in font_paths:
+        key = os.path.abspath(font_path)
+        mtime = os.path.getmtime(font_path)
+        entry = known.get(key)
+        if entry is None or entry[0] != mtime:
+            entry = [mtime, _sniff_font_family(font_path)]
+            if entry[1] is not None:  # Unreadable now, so try again next run
+                known[key] = entry
+                changed = True
+        if entry[1] is not None:
+            families.setdefault(entry[1], []).append(font_path)
+    
+    if changed:
+        try:
+            os.makedirs(os.path.dirname(FONT_INDEX_PATH), exist_ok=True)
+            tmp_path = f"{FONT_INDEX_PATH}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(known, f)
+            os.replace(tmp_path, FONT_INDEX_PATH)
+        except OSError as e:
+            logger.warning("Could not write font index %s: %s", FONT_INDEX_PATH, e)
+    
+    return families
+
+
+# foreach field, values per element and array dtype of the attribute types
+# _reorder_vertices_by_first_use() can permute
+_POINT_ATTRIBUTE_LAYOUT = {
+    'FLOAT': ('value', 1, np.float32),
+    'INT': ('value', 1, np.int32),
+    'INT8': ('value', 1, np.int32),
+    'BOOLEAN': ('value', 1, bool),
+    'FLOAT2': ('vector', 2, np.float32),
+    'FLOAT_VECTOR': ('vector', 3, np.float32),
+    'FLOAT_COLOR': ('color', 4, np.float32),
+    'BYTE_COLOR': ('color', 4, np.float32),
+    'INT32_2D': ('value', 2, np.int32),
+    'QUATERNION': ('value', 4, np.float32),
+}
+
+
+def _reorder_vertices_by_first_use(mesh: bpy.types.Mesh) -> bool:
+    """
+    Renumber a mesh's vertices in the order its face loops first reference them.
+    
+    Boolean output lists vertices in CSG order, scattered relative to the faces
+    using them; first-use order keeps neighbouring faces' vertices close in
+    memory. Vertex positions, every POINT-domain attribute and shape key are
+    permuted along with the loop and edge indices; loop and face data (UVs,
+    materials, smoothing) are untouched. Vertex group weights cannot be
+    permuted in bulk, so meshes of objects with vertex groups must not be
+    passed in. A mesh with a POINT attribute of another type is left as is.
+    
+    Args:
+        mesh: Mesh to reorder in place
+        
+    Returns:
+        True if the mesh was reordered
+    """
+    
+    n_verts, n_loops, n_edges = len(mesh.vertices), len(mesh.loops), len(mesh.edges)
+    if n_verts == 0:
+        return False
+    
+    point_attributes = [attribute for attribute in mesh.attributes if attribute.domain == 'POINT']
+    unsupported = [attribute.name for attribute in point_attributes
+                   if attribute.data_type not in _POINT_ATTRIBUTE_LAYOUT]
+    if unsupported:
+        logger.debug("Keeping vertex order; cannot permute attributes %s", unsupported)
+        return False
+    
+    loop_verts = np.empty(n_loops, dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_verts)
+    
+    # Vertices in order of first use; unused (loose) vertices go last
+    _, first_loop = np.unique(loop_verts, return_index=True)
+    used = np.unique(loop_verts)
+    order = np.concatenate([used[np.argsort(first_loop)], np.setdiff1d(np.arange(n_verts), used)])
+    remap = np.empty(n_verts, dtype=np.int32)
+    remap[order] = np.arange(n_verts, dtype=np.int32)
+    
+    # Positions are the 'position' attribute since Blender 3.5; older versions keep them separately
+    if "position" not in mesh.attributes:
+        co = np.empty(n_verts * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", co)
+        mesh.vertices.foreach_set("co", co.reshape(-1, 3)[order].ravel())
+    
+    for attribute in point_attributes:
+        field, width, dtype = _POINT_ATTRIBUTE_LAYOUT[attribute.data_type]
+        values = np.empty(n_verts * width, dtype=dtype)
+        attribute.data.foreach_get(field, values)
+        attribute.data.foreach_set(field, values.reshape(n_verts, width)[order].ravel())
+    
+    if mesh.shape_keys is not None:
+        key_co = np.empty(n_verts * 3, dtype=np.float32)
+        for key_block in mesh.shape_keys.key_blocks:
+            key_block.data.foreach_get("co", key_co)
+            key_block.data.foreach_set("co", key_co.reshape(-1, 3)[order].ravel())
+    
+    mesh.loops.foreach_set("vertex_index", remap[loop_verts])
+    
+    edge_verts = np.empty(n_edges * 2, dtype=np.int32)
+    mesh.edges.foreach_get("vertices", edge_verts)
+    mesh.edges.foreach_set("vertices", remap[edge_verts])
+    
+    mesh.update()
+    return True
+
+
+def _cylinder_radius_height(cylinder: bpy.types.Object) -> Tuple[float, float]:
+    """
+    Get a cylinder's radius and height without re-evaluating its bounding box.
+    
+    Cylinders from CylinderGenerator carry the dimensions they were generated
+    with as custom properties. Debossing only cuts inside the surface, so those
+    stay valid. Other objects are measured on every call and left unchanged.
+    
+    Args:
+        cylinder: The gas cylinder object
+        
+    Returns:
+        Tuple of (radius, height) in Blender units
+    """
+    
+    height = cylinder.get(HEIGHT_PROP)
+    radius = cylinder.get(RADIUS_PROP)
+    if height is not None and radius is not None:
+        return radius, height
+    
+    dx, dy, dz = cylinder.dimensions.to_tuple()
+    return max(dx, dy) / 2, dz
+
 
 class TextEmbosser:
     """Handles text debossing/stamping effects on cylinder surfaces."""
     
-    def __init__(self, font_dir: str = "fonts/", font_style: str = "industrial"):
+    # Stamps' worth of random draws generated per refill
+    DRAW_BATCH_SIZE = 256
+    
+    # Rasterized pixels per text size unit for bump-mapped text decals
+    DECAL_EM_PIXELS = 96
+    
+    def __init__(self, font_dir: str = "fonts/", font_style: str = "industrial",
+                 seed: Optional[int] = None, charset: Optional[str] = None,
+                 font_family: Optional[str] = None):
         """
         Initialize the text embosser with font configuration.
         
         Args:
             font_dir: Directory containing font files
             font_style: Preferred font style (industrial, monospace, default)
+            seed: Seed for the embosser's random generator (None for random stamps)
+            charset: Every character that will be stamped; when given, fonts are
+                subsetted to these glyphs so Blender parses much smaller files
+            font_family: Use only the fonts of this family (e.g. 'FreesiaUPC')
+                instead of preferring FreesiaUPC over the other fonts
         """
         
         self.font_dir = font_dir
         self.font_style = font_style
+        self.charset = charset
         self.available_fonts = self._load_available_fonts()
         
+        self.font_family = font_family
+        if font_family:
+            family_fonts = _font_family_index(self.available_fonts).get(font_family)
+            if family_fonts:
+                self.available_fonts = family_fonts
+            else:
+                logger.warning("Font family '%s' not found in %s - using all fonts", font_family, font_dir)
+                self.font_family = None
+        
         # Text embossing parameters
         self.deboss_depth_range = (0.001, 0.005)  # Depth variation in Blender units
         self.text_size_range = (0.15, 0.25)      # Text size relative to cylinder
+        self.boolean_solver = 'FAST'              # 'EXACT' is more robust but much slower
+        self.reorder_vertices = True              # Renumber cut vertices for memory locality
+        
+        # Loaded font datablocks by file path, so each face is parsed once
+        self._font_cache = {}
+        self._default_font = None
+        
+        # Persistent template text curve (shared by both deboss paths) and the
+        # cutters of deboss_live()/set_text() and apply_debossed_text()
+        self._curve = None
+        self._text_obj = None
+        self._cutter = None
+        self._stamp_cutter = None
+        
+        # Bump-mapped text decal materials by base material name
+        self._decal_materials = {}
+        
+        # Pre-drawn randomness, one row per stamp: uniform [size, depth, height,
+        # font] fractions and a front/back sign. _draw/_side hold the current stamp's.
+        self._rng = np.random.default_rng(seed)
+        self._draws = None
+        self._sides = None
+        self._draw_cursor = 0
+        self._draw = None
+        self._side = 1
         
-        logger.info(f"TextEmbosser initialized with {len(self.available_fonts)} fonts")
+        logger.info("TextEmbosser initialized with %d fonts", len(self.available_fonts))
     
     def _load_available_fonts(self) -> List[str]:
         """
@@ -53,44 +336,40 @@ class TextEmbosser:
             List of font file paths
         """
         
-        fonts = []
-        font_extensions = ['.ttf', '.otf', '.woff']
+        key = (os.path.abspath(self.font_dir), self.font_style)
+        if key in _FONT_SCAN_CACHE:
+            return list(_FONT_SCAN_CACHE[key])
         
         # Build search paths based on font style preference
         search_paths = []
         
-        if self.font_style == 'industrial':
-            search_paths.append(os.path.join(self.font_dir, 'industrial'))
-        elif self.font_style == 'monospace':
-            search_paths.append(os.path.join(self.font_dir, 'monospace'))
-        elif self.font_style == 'default':
-            search_paths.append(os.path.join(self.font_dir, 'default'))
+        if self.font_style in FONT_STYLE_DIRS:
+            search_paths.append(os.path.join(self.font_dir, self.font_style))
         
         # Fallback to all font directories
-        search_paths.extend([
-            os.path.join(self.font_dir, 'industrial'),
-            os.path.join(self.font_dir, 'monospace'),
-            os.path.join(self.font_dir, 'default')
-        ])
+        search_paths.extend(os.path.join(self.font_dir, style) for style in FONT_STYLE_DIRS)
         
-        # Search for font files
-        for search_path in search_paths:
-            if os.path.exists(search_path):
-                for ext in font_extensions:
-                    pattern = os.path.join(search_path, f"**/*{ext}")
-                    fonts.extend(glob.glob(pattern, recursive=True))
+        # Walk each directory once, keeping the first occurrence of every file
+        fonts = []
+        seen = set()
+        for search_path in dict.fromkeys(search_paths):
+            for font_path in _scan_font_files(search_path):
+                if font_path not in seen:
+                    seen.add(font_path)
+                    fonts.append(font_path)
         
-        # Remove duplicates
-        fonts = list(set(fonts))
+        _FONT_SCAN_CACHE[key] = fonts
         
-        logger.debug(f"Found fonts: {[os.path.basename(f) for f in fonts]}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Found fonts: %s", [os.path.basename(f) for f in fonts])
         
-        return fonts
+        return list(fonts)
     
     def apply_debossed_text(self, 
                            cylinder: bpy.types.Object, 
                            text_content: str,
-                           position_height: Optional[float] = None) -> bpy.types.Object:
+                           position_height: Optional[float] = None,
+                           solver: Optional[str] = None) -> bpy.types.Object:
         """
         Apply debossed text effect to the cylinder surface.
         
@@ -98,33 +377,339 @@ class TextEmbosser:
             cylinder: The gas cylinder object
             text_content: Text string to emboss
             position_height: Vertical position on cylinder (None for random)
+            solver: Boolean solver ('FAST' or 'EXACT', None for self.boolean_solver)
             
         Returns:
-            The text object created for the debossing effect
+            The (reused, unlinked) cutter object; its mesh is emptied unless DEBUG logging is on
         """
         
-        logger.info(f"Applying debossed text: '{text_content}'")
+        logger.info("Applying debossed text: '%s'", text_content)
         
-        # Create text object
-        text_obj = self._create_text_object(text_content)
+        return self.apply_debossed_texts(cylinder, [text_content], [position_height], solver)
+    
+    def apply_debossed_texts(self,
+                             cylinder: bpy.types.Object,
+                             texts: List[str],
+                             position_heights: Optional[List[Optional[float]]] = None,
+                             solver: Optional[str] = None) -> bpy.types.Object:
+        """
+        Deboss several texts (e.g. serial, date and capacity) in one boolean pass.
         
-        # Position text on cylinder surface
-        self._position_text_on_cylinder(text_obj, cylinder, position_height)
+        The placed text meshes are joined into a single cutter, so the cylinder
+        goes through the boolean once instead of once per text.
         
-        # Convert text to mesh for boolean operations
-        text_mesh = self._convert_text_to_mesh(text_obj)
+        Args:
+            cylinder: The gas cylinder object
+            texts: Text strings to emboss
+            position_heights: Vertical position per text (None entries or list for random)
+            solver: Boolean solver ('FAST' or 'EXACT', None for self.boolean_solver)
+            
+        Returns:
+            The (reused, unlinked) cutter object; its mesh is emptied unless DEBUG logging is on
+        """
         
-        # Apply debossing effect using boolean modifier
-        self._apply_boolean_deboss(cylinder, text_mesh)
+        if not texts:
+            raise ValueError("apply_debossed_texts needs at least one text")
+        if position_heights is None:
+            position_heights = [None] * len(texts)
         
-        # Clean up temporary objects
-        bpy.data.objects.remove(text_obj, do_unlink=True)
+        # Keep the pipeline off the undo stack
+        with undo_disabled():
+            joined = bmesh.new()
+            
+            for text_content, position_height in zip(texts, position_heights):
+                # Reuse the template text object; only its content and style change
+                text_obj = self._create_text_object(text_content)
+                
+                # Convert text to mesh for boolean operations
+                text_mesh = self._convert_text_to_mesh(text_obj)
+                
+                # Position the cutter on cylinder surface, then bake the placement
+                # into the mesh so every text can share one cutter
+                self._position_text_on_cylinder(text_mesh, cylinder, position_height)
+                text_mesh.data.transform(text_mesh.matrix_basis)
+                joined.from_mesh(text_mesh.data)  # Appends to the geometry already loaded
+            
+            joined.to_mesh(text_mesh.data)
+            joined.free()
+            text_mesh.matrix_basis.identity()
+            
+            # Apply debossing effect using boolean modifier
+            bpy.context.collection.objects.link(text_mesh)
+            self._apply_boolean_deboss(cylinder, text_mesh, solver)
+            
+            # Unlink the cutter again; the next stamp reuses it
+            for collection in list(text_mesh.users_collection):
+                collection.objects.unlink(text_mesh)
+            
+            # The cut is baked, so the text geometry is only kept for debugging
+            if not logger.isEnabledFor(logging.DEBUG):
+                text_mesh.data.clear_geometry()
         
         return text_mesh
     
+    def deboss_live(self,
+                    cylinder: bpy.types.Object,
+                    text_content: str,
+                    position_height: Optional[float] = None,
+                    solver: Optional[str] = None) -> bpy.types.Object:
+        """
+        Deboss text through a live boolean modifier with a reusable cutter.
+        
+        Unlike apply_debossed_text() the modifier is not applied, so the cylinder
+        mesh is left untouched (and may be shared) and the text curve and cutter
+        object persist between calls. Changing the text only needs set_text().
+        
+        Args:
+            cylinder: The gas cylinder object
+            text_content: Text string to emboss
+            position_height: Vertical position on cylinder (None for random)
+            solver: Boolean solver ('FAST' or 'EXACT', None for self.boolean_solver)
+            
+        Returns:
+            The cutter object referenced by the boolean modifier
+        """
+        
+        logger.info("Applying live debossed text: '%s'", text_content)
+        
+        self.set_text(text_content)
+        self._position_text_on_cylinder(self._cutter, cylinder, position_height)
+        
+        boolean_mod = cylinder.modifiers.get("TextDeboss")
+        if boolean_mod is None:
+            boolean_mod = cylinder.modifiers.new(name="TextDeboss", type='BOOLEAN')
+            boolean_mod.operation = 'DIFFERENCE'
+        self._configure_solver(boolean_mod, solver)
+        boolean_mod.object = self._cutter
+        
+        return self._cutter
+    
+    def set_text(self, text_content: str) -> None:
+        """
+        Replace the text of the persistent cutter.
+        
+        Only the curve body, font, size and depth change; the cutter's mesh is
+        regenerated from the curve and every modifier using it updates on the
+        next depsgraph evaluation.
+        
+        Args:
+            text_content: New text string
+        """
+        
+        self._ensure_live_cutter()
+        text_obj = self._create_text_object(text_content)
+        
+        # The curve extrudes symmetrically; shift it so it cuts inward like the extruded mesh
+        deboss_depth = self._scaled_draw(1, self.deboss_depth_range)
+        text_obj.data.extrude = deboss_depth / 2
+        text_obj.data.fill_mode = 'BOTH'  # Closed front and back faces make a solid cutter
+        
+        mesh = bpy.data.meshes.new_from_object(text_obj)
+        mesh.transform(Matrix.Translation((0, 0, -deboss_depth / 2)))
+        
+        previous_mesh = self._cutter.data
+        self._cutter.data = mesh
+        bpy.data.meshes.remove(previous_mesh)
+        
+        logger.debug("Live text set to '%s' with deboss depth: %.4f", text_content, deboss_depth)
+    
+    def apply_displacement_text(self,
+                                cylinder: bpy.types.Object,
+                                text_content: str,
+                                position_height: Optional[float] = None) -> bpy.types.Material:
+        """
+        Stamp text as a bump-mapped decal instead of cutting it into the mesh.
+        
+        The text is rasterized with PIL into a small height image that the
+        cylinder's material reads through its UVs, so no boolean is evaluated and
+        the (possibly shared) cylinder mesh is left untouched. The decal reaches
+        the shading normals only, so deboss walls are not modelled. Like
+        deboss_live(), the decal material is reused: cylinders with the same base
+        material all show the latest text.
+        
+        Args:
+            cylinder: Gas cylinder object from CylinderGenerator
+            text_content: Text string to stamp
+            position_height: Vertical position on cylinder (None for random)
+            
+        Returns:
+            The decal material assigned to the cylinder
+        """
+        
+        if ImageFont is None:
+            raise ImportError("apply_displacement_text() requires Pillow in Blender's Python")
+        
+        logger.info("Applying displacement text: '%s'", text_content)
+        
+        self._next_draw()
+        heights = self._rasterize_text(text_content, self._choose_font(text_content))
+        text_size = self._scaled_draw(0, self.text_size_range)
+        deboss_depth = self._scaled_draw(1, self.deboss_depth_range)
+        
+        cylinder_radius, cylinder_height = _cylinder_radius_height(cylinder)
+        if position_height is None:
+            margin = cylinder_height * 0.2
+            position_height = self._scaled_draw(2, (margin, cylinder_height - margin))
+        
+        # The side wall is unrolled over u in [0, 1) from +X and v in [0.5, 1] bottom to top
+        rows, cols = heights.shape
+        width_uv = cols / self.DECAL_EM_PIXELS * text_size / (math.tau * cylinder_radius)
+        height_uv = rows / self.DECAL_EM_PIXELS * text_size / cylinder_height * 0.5
+        center_u = 0.0 if self._side > 0 else 0.5  # Front or back of cylinder
+        center_v = 0.5 + 0.5 * position_height / cylinder_height
+        
+        material = self._get_decal_material(cylinder.material_slots[0].material)
+        nodes = material.node_tree.nodes
+        nodes["TextDecalOffset"].inputs[1].default_value = (center_u, center_v, 0.0)
+        nodes["TextDecalMapping"].inputs['Scale'].default_value = (1.0 / width_uv, 1.0 / height_uv, 1.0)
+        nodes["TextDecalBump"].inputs['Distance'].default_value = deboss_depth
+        
+        image = nodes["TextDecalHeight"].image
+        if tuple(image.size) != (cols, rows):
+            image.scale(cols, rows)
+        pixels = np.empty((rows * cols, 4), dtype=np.float32)
+        pixels[:, :3] = heights.reshape(-1, 1)
+        pixels[:, 3] = 1.0
+        image.pixels.foreach_set(pixels.ravel())
+        image.update()
+        
+        # Per-object material, so the shared cylinder mesh keeps its own
+        slot = cylinder.material_slots[0]
+        slot.link = 'OBJECT'
+        slot.material = material
+        
+        logger.debug("Text decal at (u=%.3f, v=%.3f) with deboss depth: %.4f",
+                     center_u, center_v, deboss_depth)
+        
+        return material
+    
+    def _rasterize_text(self, text_content: str, font: Optional[bpy.types.VectorFont]) -> np.ndarray:
+        """
+        Rasterize text into a height map, DECAL_EM_PIXELS pixels per text size unit.
+        
+        Args:
+            text_content: Text string to rasterize
+            font: Font datablock whose file should be used (None for Pillow's default)
+            
+        Returns:
+            Float32 array of shape (rows, cols) in [0, 1], bottom row first like Blender images
+        """
+        
+        font_path = bpy.path.abspath(font.filepath) if font is not None else ""
+        if os.path.isfile(font_path):
+            pil_font = ImageFont.truetype(font_path, self.DECAL_EM_PIXELS)
+        else:
+            pil_font = ImageFont.load_default(size=self.DECAL_EM_PIXELS)  # Blender's built-in font has no file
+        
+        left, top, right, bottom = pil_font.getbbox(text_content)
+        canvas = Image.new('L', (max(right - left, 1), max(bottom - top, 1)))
+        ImageDraw.Draw(canvas).text((-left, -top), text_content, font=pil_font, fill=255)
+        
+        return np.asarray(canvas, dtype=np.float32)[::-1] / 255.0
+    
+    def _get_decal_material(self, base: bpy.types.Material) -> bpy.types.Material:
+        """
+        Return a copy of a cylinder material with a text decal bump, built once per base material.
+        
+        The decal bump is chained after the material's surface bump node, so both
+        the surface noise and the text reach every shader that used the surface bump.
+        
+        Args:
+            base: Cylinder material to extend
+            
+        Returns:
+            Material with TextDecalOffset/TextDecalMapping/TextDecalHeight/TextDecalBump nodes
+        """
+        
+        if "TextDecalBump" in base.node_tree.nodes:
+            return base  # Already a decal material, e.g. a cylinder stamped twice
+        
+        material = self._decal_materials.get(base.name)
+        if material is not None and is_alive(material):
+            return material
+        
+        material = base.copy()
+        material.name = f"{base.name}_TextDecal"
+        nodes = material.node_tree.nodes
+        links = material.node_tree.links
+        
+        # Shaders whose normals come from the surface bump (or all shaders without one)
+        surface_bump = next((node for node in nodes if node.type == 'BUMP'), None)
+        if surface_bump is not None:
+            targets = [link.to_socket for link in surface_bump.outputs['Normal'].links]
+        else:
+            targets = [node.inputs['Normal'] for node in nodes if node.type.startswith('BSDF')]
+        
+        uv_map = nodes.new(type='ShaderNodeUVMap')
+        uv_map.uv_map = "UVMap"
+        
+        # Offset to the decal center, wrapping u so a decal on the seam stays whole
+        offset = nodes.new(type='ShaderNodeVectorMath')
+        offset.name = "TextDecalOffset"
+        offset.operation = 'SUBTRACT'
+        wrap = nodes.new(type='ShaderNodeVectorMath')
+        wrap.operation = 'WRAP'
+        wrap.inputs[1].default_value = (0.5, 10.0, 10.0)     # Max
+        wrap.inputs[2].default_value = (-0.5, -10.0, -10.0)  # Min
+        
+        mapping = nodes.new(type='ShaderNodeMapping')
+        mapping.name = "TextDecalMapping"
+        mapping.inputs['Location'].default_value = (0.5, 0.5, 0.0)
+        
+        height_texture = nodes.new(type='ShaderNodeTexImage')
+        height_texture.name = "TextDecalHeight"
+        height_texture.extension = 'CLIP'  # Zero height outside the decal
+        image = bpy.data.images.new(f"{material.name}_Height", width=1, height=1,
+                                    alpha=False, float_buffer=True)
+        image.colorspace_settings.name = 'Non-Color'
+        height_texture.image = image
+        
+        bump = nodes.new(type='ShaderNodeBump')
+        bump.name = "TextDecalBump"
+        bump.invert = True  # Ink is pressed into the surface
+        
+        links.new(uv_map.outputs['UV'], offset.inputs[0])
+        links.new(offset.outputs['Vector'], wrap.inputs[0])
+        links.new(wrap.outputs['Vector'], mapping.inputs['Vector'])
+        links.new(mapping.outputs['Vector'], height_texture.inputs['Vector'])
+        links.new(height_texture.outputs['Color'], bump.inputs['Height'])
+        if surface_bump is not None:
+            links.new(surface_bump.outputs['Normal'], bump.inputs['Normal'])
+        for socket in targets:
+            links.new(bump.outputs['Normal'], socket)
+        
+        self._decal_materials[base.name] = material
+        return material
+    
+    def live_objects(self) -> List[bpy.types.Object]:
+        """
+        Get the scene objects owned by the live deboss setup.
+        
+        Returns:
+            List holding the cutter object, or empty before deboss_live() is used
+        """
+        
+        return [self._cutter] if self._cutter is not None else []
+    
+    def _ensure_live_cutter(self) -> None:
+        """Create the persistent cutter of the live deboss setup on first use."""
+        
+        if self._cutter is not None:
+            return
+        
+        self._cutter = bpy.data.objects.new("TextMesh_LiveText", bpy.data.meshes.new("TextMesh_LiveText"))
+        bpy.context.collection.objects.link(self._cutter)
+        
+        # Hide the cutter (the boolean modifier still evaluates it)
+        self._cutter.hide_render = True
+        self._cutter.hide_viewport = True
+    
     def _create_text_object(self, text_content: str) -> bpy.types.Object:
         """
-        Create a Blender text object with specified content and font.
+        Set up the persistent template text object with specified content and font.
+        
+        The curve and its object are created on first use and stay out of the
+        scene; they are only a source for cutter meshes.
         
         Args:
             text_content: The text string to create
@@ -133,47 +718,107 @@ class TextEmbosser:
             Blender text object
         """
         
-        # Create text object
-        bpy.ops.object.text_add()
-        text_obj = bpy.context.active_object
-        text_obj.name = f"Text_{text_content}"
+        if self._curve is None:
+            self._curve = bpy.data.curves.new("EmbosserTemplate", type='FONT')
+            self._curve.align_x = 'CENTER'
+            self._curve.align_y = 'CENTER'
+            self._text_obj = bpy.data.objects.new("EmbosserTemplate", self._curve)
+        
+        curve = self._curve
+        self._next_draw()
         
         # Set text content
-        text_obj.data.body = text_content
+        curve.body = text_content
+        
+        curve.font = self._choose_font(text_content)
+        
+        # Set text properties
+        curve.size = self._scaled_draw(0, self.text_size_range)
+        curve.extrude = 0.0  # Flat unless the caller extrudes it
+        
+        return self._text_obj
+    
+    def _choose_font(self, text_content: str = "") -> Optional[bpy.types.VectorFont]:
+        """
+        Pick the font for the next text: a font of the requested family, otherwise
+        FreesiaUPC if present, else a random custom font.
         
-        # Try to load FreesiaUPC font first
-        fresia_font = self._load_fresia_font()
+        Args:
+            text_content: Text that will use the font, see _select_random_font()
+        
+        Returns:
+            Font datablock (Blender's default font on failure)
+        """
+        
+        # Try to load FreesiaUPC font first, unless a family was requested
+        fresia_font = self._load_fresia_font() if not self.font_family else None
         if fresia_font:
-            text_obj.data.font = fresia_font
             logger.debug("Applied FreesiaUPC font")
-        else:
-            # Load and apply custom font
-            font_path = self._select_random_font()
-            if font_path and os.path.exists(font_path):
-                try:
-                    font = bpy.data.fonts.load(font_path)
-                    text_obj.data.font = font
-                    logger.debug(f"Applied font: {os.path.basename(font_path)}")
-                except Exception as e:
-                    logger.warning(f"Failed to load font {font_path}: {e}")
-                    # Use default Blender font
-                    text_obj.data.font = bpy.data.fonts.get('Bfont')
-            else:
+            return fresia_font
+        
+        # Load and apply custom font
+        font_path = self._select_random_font(text_content)
+        if font_path and os.path.exists(font_path):
+            try:
+                font = self._load_font(font_path)
+                logger.debug("Applied font: %s", os.path.basename(font_path))
+                return font
+            except Exception as e:
+                logger.warning("Failed to load font %s: %s", font_path, e)
                 # Use default Blender font
-                text_obj.data.font = bpy.data.fonts.get('Bfont')
-                logger.debug("Using default Blender font")
+                return self._get_default_font()
         
-        # Set text properties
-        text_obj.data.size = random.uniform(*self.text_size_range)
-        text_obj.data.align_x = 'CENTER'
-        text_obj.data.align_y = 'CENTER'
+        # Use default Blender font
+        logger.debug("Using default Blender font")
+        return self._get_default_font()
+    
+    def _load_font(self, font_path: str) -> bpy.types.VectorFont:
+        """
+        Load a font file once and reuse its datablock afterwards.
+        
+        Args:
+            font_path: Path to the font file
+            
+        Returns:
+            Font datablock for the file
+        """
+        
+        font = self._font_cache.get(font_path)
+        if font is not None and is_alive(font):
+            return font
+        
+        load_path = font_path
+        if self.charset:
+            load_path = subset_fonts([font_path], self.charset, FONT_SUBSET_DIR)[0]
+        
+        # check_existing returns a datablock already loaded from this path instead of a duplicate
+        font = bpy.data.fonts.load(load_path, check_existing=True)
+        self._font_cache[font_path] = font
+        return font
+    
+    def _get_default_font(self) -> Optional[bpy.types.VectorFont]:
+        """
+        Get Blender's built-in font, looked up once.
         
-        return text_obj
+        Returns:
+            The 'Bfont' datablock, or None if it is not loaded
+        """
+        
+        if self._default_font is None:
+            self._default_font = bpy.data.fonts.get('Bfont')
+        return self._default_font
     
-    def _select_random_font(self) -> Optional[str]:
+    def _select_random_font(self, text_content: str = "") -> Optional[str]:
         """
         Select a random font from available fonts.
         
+        The choice for a text comes from a stable hash of the string, so it always
+        renders in the same font regardless of seed, shard or plan order, and
+        repeated strings reuse an already loaded font datablock.
+        
+        Args:
+            text_content: Text the font is for ("" for a per-stamp random choice)
+        
         Returns:
             Path to selected font file, or None if no fonts available
         """
@@ -181,7 +826,37 @@ class TextEmbosser:
         if not self.available_fonts:
             return None
         
-        return random.choice(self.available_fonts)
+        if text_content:
+            index = zlib.crc32(text_content.encode('utf-8')) % len(self.available_fonts)
+        else:
+            index = int(self._draw[3] * len(self.available_fonts))
+        
+        return self.available_fonts[index]
+    
+    def _prefill(self, n: int) -> None:
+        """Draw the random values for the next n stamps in one batch."""
+        
+        self._draws = self._rng.random((n, 4))
+        self._sides = self._rng.choice((1, -1), size=n)
+        self._draw_cursor = 0
+    
+    def _next_draw(self) -> None:
+        """Make the next pre-drawn row current, refilling the batch when it runs out."""
+        
+        if self._draws is None or self._draw_cursor >= len(self._draws):
+            self._prefill(self.DRAW_BATCH_SIZE)
+        
+        index = self._draw_cursor
+        self._draw_cursor = index + 1
+        
+        self._draw = self._draws[index]
+        self._side = int(self._sides[index])
+    
+    def _scaled_draw(self, column: int, value_range) -> float:
+        """Map one uniform of the current stamp's row onto value_range."""
+        
+        low, high = value_range
+        return low + float(self._draw[column]) * (high - low)
     
     def _position_text_on_cylinder(self, 
                                   text_obj: bpy.types.Object, 
@@ -197,22 +872,18 @@ class TextEmbosser:
         """
         
         # Get cylinder dimensions
-        cylinder_radius = max(cylinder.dimensions.x, cylinder.dimensions.y) / 2
-        cylinder_height = cylinder.dimensions.z
+        cylinder_radius, cylinder_height = _cylinder_radius_height(cylinder)
         
         # Calculate text position
         if position_height is None:
             # Random height within middle 60% of cylinder
             margin = cylinder_height * 0.2
-            position_height = random.uniform(margin, cylinder_height - margin)
-        
-        # Random azimuthal angle around cylinder
-        azimuth_angle = random.uniform(0, 2 * 3.14159)
+            position_height = self._scaled_draw(2, (margin, cylinder_height - margin))
         
         # Position text slightly outside cylinder surface
         offset_distance = cylinder_radius + 0.01
         
-        x = offset_distance * random.choice([1, -1])  # Front or back of cylinder
+        x = offset_distance * self._side  # Front or back of cylinder
         y = 0
         z = position_height
         
@@ -222,9 +893,9 @@ class TextEmbosser:
         if x > 0:
             text_obj.rotation_euler = (0, 0, 0)  # Face forward
         else:
-            text_obj.rotation_euler = (0, 0, 3.14159)  # Face backward
+            text_obj.rotation_euler = (0, 0, math.pi)  # Face backward
         
-        logger.debug(f"Text positioned at ({x:.3f}, {y:.3f}, {z:.3f})")
+        logger.debug("Text positioned at (%.3f, %.3f, %.3f)", x, y, z)
     
     def _convert_text_to_mesh(self, text_obj: bpy.types.Object) -> bpy.types.Object:
         """
@@ -234,59 +905,87 @@ class TextEmbosser:
             text_obj: The text object to convert
             
         Returns:
-            Mesh object created from text
+            Reusable (unlinked) cutter object holding the extruded text mesh
         """
         
-        # Select and convert text to mesh
-        bpy.context.view_layer.objects.active = text_obj
-        bpy.ops.object.convert(target='MESH')
-        
-        text_mesh = bpy.context.active_object
-        text_mesh.name = f"TextMesh_{text_obj.name}"
-        
-        # Extrude text to give it depth for boolean operation
-        bpy.ops.object.mode_set(mode='EDIT')
-        bpy.ops.mesh.select_all(action='SELECT')
+        # Tessellate the text curve into a flat mesh
+        mesh = bpy.data.meshes.new_from_object(text_obj)
+        mesh.name = "TextMesh_Stamp"
         
-        # Extrude inward for debossing effect
-        deboss_depth = random.uniform(*self.deboss_depth_range)
-        bpy.ops.mesh.extrude_region_move(
-            TRANSFORM_OT_translate={"value": (0, 0, -deboss_depth)}
-        )
+        # Extrude inward for debossing effect; the original faces are kept as
+        # the cap so the cutter is closed
+        deboss_depth = self._scaled_draw(1, self.deboss_depth_range)
+        bm = bmesh.new()
+        bm.from_mesh(mesh)
+        extruded = bmesh.ops.extrude_face_region(bm, geom=bm.faces[:], use_keep_orig=True)
+        extruded_verts = [elem for elem in extruded['geom'] if isinstance(elem, bmesh.types.BMVert)]
+        bmesh.ops.translate(bm, verts=extruded_verts, vec=(0, 0, -deboss_depth))
+        bmesh.ops.recalc_face_normals(bm, faces=bm.faces[:])
+        bm.to_mesh(mesh)
+        bm.free()
         
-        bpy.ops.object.mode_set(mode='OBJECT')
+        # Swap the mesh into the reusable (unlinked) cutter object
+        text_mesh = self._stamp_cutter
+        if text_mesh is None:
+            text_mesh = self._stamp_cutter = bpy.data.objects.new("TextMesh_Stamp", mesh)
+        else:
+            previous_mesh = text_mesh.data
+            text_mesh.data = mesh
+            bpy.data.meshes.remove(previous_mesh)
         
-        logger.debug(f"Text mesh created with deboss depth: {deboss_depth:.4f}")
+        logger.debug("Text mesh created with deboss depth: %.4f", deboss_depth)
         
         return text_mesh
     
     def _apply_boolean_deboss(self, 
                              cylinder: bpy.types.Object, 
-                             text_mesh: bpy.types.Object) -> None:
+                             text_mesh: bpy.types.Object,
+                             solver: Optional[str] = None) -> None:
         """
         Apply boolean difference operation to create debossed effect.
         
         Args:
             cylinder: The target cylinder object
             text_mesh: The text mesh to subtract from cylinder
+            solver: Boolean solver (None for self.boolean_solver)
         """
         
         # Add boolean modifier to cylinder
         boolean_mod = cylinder.modifiers.new(name="TextDeboss", type='BOOLEAN')
         boolean_mod.operation = 'DIFFERENCE'
         boolean_mod.object = text_mesh
-        boolean_mod.solver = 'EXACT'  # More accurate but slower
+        self._configure_solver(boolean_mod, solver)
         
-        # Apply the modifier
-        bpy.context.view_layer.objects.active = cylinder
-        bpy.ops.object.modifier_apply(modifier="TextDeboss")
+        # Bake the cut into a new mesh instead of running modifier_apply; the
+        # cylinder carries no other modifiers, so its evaluated mesh is the cut
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        cut_mesh = bpy.data.meshes.new_from_object(cylinder.evaluated_get(depsgraph),
+                                                   preserve_all_data_layers=True, depsgraph=depsgraph)
+        cylinder.modifiers.remove(boolean_mod)
+        if self.reorder_vertices and not cylinder.vertex_groups:
+            _reorder_vertices_by_first_use(cut_mesh)
         
-        # Hide the text mesh (but keep it for reference)
-        text_mesh.hide_render = True
-        text_mesh.hide_viewport = True
+        previous_mesh = cylinder.data
+        cylinder.data = cut_mesh
+        if previous_mesh.users == 0:
+            bpy.data.meshes.remove(previous_mesh)
         
         logger.debug("Boolean deboss effect applied to cylinder")
     
+    def _configure_solver(self, boolean_mod: bpy.types.Modifier, solver: Optional[str] = None) -> None:
+        """
+        Set the boolean solver, skipping the costly EXACT-only guarantees.
+        
+        Args:
+            boolean_mod: Boolean modifier to configure
+            solver: 'FAST' or 'EXACT' (None for self.boolean_solver)
+        """
+        
+        boolean_mod.solver = solver or self.boolean_solver
+        # Text cutters are closed and never self-intersect
+        boolean_mod.use_self = False
+        boolean_mod.use_hole_tolerant = False
+    
     def _load_fresia_font(self) -> Optional[bpy.types.VectorFont]:
         """
         Try to load FreesiaUPC font from macOS system locations.
@@ -314,11 +1013,11 @@ class TextEmbosser:
         for font_path in font_paths:
             if os.path.exists(font_path):
                 try:
-                    font = bpy.data.fonts.load(font_path)
-                    logger.info(f"FreesiaUPC font loaded from: {font_path}")
+                    font = self._load_font(font_path)
+                    logger.info("FreesiaUPC font loaded from: %s", font_path)
                     return font
                 except Exception as e:
-                    logger.debug(f"Failed to load FreesiaUPC from {font_path}: {e}")
+                    logger.debug("Failed to load FreesiaUPC from %s: %s", font_path, e)
                     continue
         
         logger.debug("FreesiaUPC font not found in system locations")
@@ -8,18 +8,47 @@ Date: July 2025
 """
 
 import os
+import queue
+import hashlib
+import atexit
 import logging
+import numpy as np
+from logging.handlers import QueueHandler, QueueListener
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List
+from typing import Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Output directories already created by create_output_dirs()
+_CREATED_DIRS = set()
 
 
 def setup_logging(log_level: str = "INFO") -> None:
-    """Setup logging configuration for the application."""
+    """
+    Setup logging configuration for the application.
+    
+    Records are handed to a queue and written by a listener thread, so the
+    render loop never waits on the console or a log file.
+    """
+    
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(
+        fmt='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    ))
+    
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, handler)
+    listener.start()
+    atexit.register(listener.stop)  # Flushes queued records on exit
     
+    # The queue carries the bare message; the listener's handler applies the real format
     logging.basicConfig(
         level=getattr(logging, log_level.upper()),
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
+        format='%(message)s',
+        handlers=[QueueHandler(log_queue)]
     )
 
 
@@ -38,14 +67,11 @@ def load_text_dictionary(filepath: str) -> List[str]:
         UnicodeDecodeError: If the file contains invalid UTF-8
     """
     
-    text_list = []
-    
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            for line in f:
-                text = line.strip()
-                if text:  # Skip empty lines
-                    text_list.append(text)
+        # One read, then split and strip in C; read_text translates \r\n, so
+        # splitting on \n gives the same lines as iterating the file
+        raw_lines = Path(filepath).read_text(encoding='utf-8').split('\n')
+        text_list = [text for text in map(str.strip, raw_lines) if text]  # Skip empty lines
     except FileNotFoundError:
         raise FileNotFoundError(f"Dictionary file not found: {filepath}")
     except UnicodeDecodeError:
@@ -54,21 +80,79 @@ def load_text_dictionary(filepath: str) -> List[str]:
     return text_list
 
 
+def subset_fonts(font_paths: List[str], charset: str, cache_dir: str) -> List[str]:
+    """
+    Write copies of fonts that keep only the glyphs for the given characters.
+    
+    Subsets are cached in cache_dir under a hash of the font path, its
+    modification time and the character set, so each font is subsetted once.
+    Fonts that cannot be subsetted are returned unchanged, as are all fonts
+    when fontTools is not installed.
+    
+    Args:
+        font_paths: Font files to subset
+        charset: Characters that will be rendered
+        cache_dir: Directory for the subsetted .ttf files
+        
+    Returns:
+        Font paths in the same order, pointing at subsets where available
+    """
+    
+    try:
+        from fontTools.subset import Subsetter
+        from fontTools.ttLib import TTFont
+    except ImportError:
+        logger.info("fontTools not available - using full fonts")
+        return list(font_paths)
+    
+    unicodes = sorted({ord(char) for char in charset})
+    os.makedirs(cache_dir, exist_ok=True)
+    
+    subset_paths = []
+    for font_path in font_paths:
+        digest = hashlib.sha1(
+            f"{os.path.abspath(font_path)}|{os.path.getmtime(font_path)}|{charset}".encode('utf-8')
+        ).hexdigest()[:16]
+        subset_path = os.path.join(cache_dir, f"{digest}.ttf")
+        
+        if not os.path.exists(subset_path):
+            try:
+                font = TTFont(font_path)
+                subsetter = Subsetter()
+                subsetter.populate(unicodes=unicodes)
+                subsetter.subset(font)
+                font.flavor = None  # Blender loads plain TrueType/OpenType
+                # Write then rename, so parallel shards never load a partial file
+                tmp_path = f"{subset_path}.{os.getpid()}.tmp"
+                font.save(tmp_path)
+                os.replace(tmp_path, subset_path)
+            except Exception as e:
+                logger.warning("Failed to subset font %s: %s", font_path, e)
+                subset_paths.append(font_path)
+                continue
+        
+        subset_paths.append(subset_path)
+    
+    return subset_paths
+
+
 def create_output_dirs(output_base: str) -> None:
     """
     Create output directory structure if it doesn't exist.
     
+    Directories created by earlier calls are remembered, so repeated calls
+    make no filesystem requests.
+    
     Args:
         output_base: Base output directory path
     """
     
-    dirs_to_create = [
-        os.path.join(output_base, 'images'),
-        os.path.join(output_base, 'labels')
-    ]
-    
-    for dir_path in dirs_to_create:
-        Path(dir_path).mkdir(parents=True, exist_ok=True)
+    for subdir in ('images', 'labels'):
+        dir_path = os.path.join(output_base, subdir)
+        if dir_path in _CREATED_DIRS:
+            continue
+        os.makedirs(dir_path, exist_ok=True)
+        _CREATED_DIRS.add(dir_path)
 
 
 def validate_blender_context() -> bool:
@@ -86,6 +170,181 @@ def validate_blender_context() -> bool:
         return False
 
 
+def is_alive(datablock) -> bool:
+    """
+    Check that a Python reference to a Blender datablock or object is still valid.
+    
+    References kept in caches and pools outlive datablocks removed elsewhere;
+    touching a removed one raises ReferenceError.
+    
+    Args:
+        datablock: Datablock (object, mesh, material, font, ...) to check
+        
+    Returns:
+        True if the datablock still exists
+    """
+    
+    try:
+        datablock.name
+    except ReferenceError:
+        return False
+    return True
+
+
+@contextmanager
+def undo_disabled() -> Iterator[None]:
+    """
+    Temporarily disable Blender's global undo for batch operations.
+    
+    Operators called inside the block skip undo-step pushes, so the undo stack
+    does not grow with every generated object. The previous setting is restored
+    on exit.
+    """
+    
+    import bpy
+    
+    edit_prefs = bpy.context.preferences.edit
+    previous = edit_prefs.use_global_undo
+    edit_prefs.use_global_undo = False
+    
+    try:
+        yield
+    finally:
+        edit_prefs.use_global_undo = previous
+
+
+@contextmanager
+def interface_locked(scene=None) -> Iterator[None]:
+    """
+    Temporarily lock the Blender interface while a batch of scene edits is made.
+    
+    With the lock set, Blender does not redraw or re-evaluate for the UI between
+    the individual edits. The previous setting is restored on exit.
+    
+    Args:
+        scene: Scene to lock (defaults to the current scene)
+    """
+    
+    import bpy
+    
+    render = (scene or bpy.context.scene).render
+    previous = render.use_lock_interface
+    render.use_lock_interface = True
+    
+    try:
+        yield
+    finally:
+        render.use_lock_interface = previous
+
+
+class AsyncFileWriter:
+    """
+    Write output files on a background thread so the caller can move on.
+    
+    Plain file I/O does not touch bpy, so it can overlap with the next scene
+    setup and render. Errors from finished writes are re-raised by the next
+    write() or by close(). Use as a context manager to wait for every write.
+    """
+    
+    def __init__(self, max_workers: int = 1):
+        """
+        Initialize the writer thread pool.
+        
+        Args:
+            max_workers: Number of writer threads
+        """
+        
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="file-writer")
+        self._pending: List[Future] = []
+    
+    def write_text(self, filepath: str, text: str) -> None:
+        """
+        Queue a UTF-8 text file write.
+        
+        Args:
+            filepath: Destination path
+            text: File contents
+        """
+        
+        self._reap()
+        self._pending.append(self._executor.submit(Path(filepath).write_text, text, encoding='utf-8'))
+    
+    def close(self) -> None:
+        """Wait for all queued writes and stop the writer threads."""
+        
+        self._executor.shutdown(wait=True)
+        pending, self._pending = self._pending, []
+        for future in pending:
+            future.result()
+    
+    def _reap(self) -> None:
+        """Drop finished writes, raising the first error among them."""
+        
+        still_pending = []
+        for future in self._pending:
+            if future.done():
+                future.result()
+            else:
+                still_pending.append(future)
+        self._pending = still_pending
+    
+    def __enter__(self) -> "AsyncFileWriter":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+def enable_gpu_devices(preferred: tuple = ('OPTIX', 'CUDA', 'HIP', 'METAL', 'ONEAPI')) -> Optional[str]:
+    """
+    Enable every Cycles GPU device of the first available compute backend.
+    
+    Args:
+        preferred: Compute device types to try, in order of preference
+        
+    Returns:
+        The compute device type in use, or None when only the CPU is available
+    """
+    
+    import bpy
+    
+    prefs = bpy.context.preferences.addons['cycles'].preferences
+    
+    for device_type in preferred:
+        try:
+            prefs.compute_device_type = device_type
+        except TypeError:
+            continue  # Backend not compiled into this Blender build
+        
+        prefs.get_devices()
+        gpus = [device for device in prefs.devices if device.type == device_type]
+        if gpus:
+            for device in prefs.devices:
+                device.use = device.type == device_type
+            return device_type
+    
+    prefs.compute_device_type = 'NONE'
+    return None
+
+
+class _SafeFilenameTable(dict):
+    """str.translate table for get_safe_filename, filled in per code point on first use."""
+    
+    def __missing__(self, codepoint: int) -> Optional[str]:
+        char = chr(codepoint)
+        if char.isalnum() or char in '-_':
+            mapped = char
+        elif char in ' /\\:*"<>|':
+            mapped = '_'
+        else:
+            mapped = None  # Dropped
+        self[codepoint] = mapped
+        return mapped
+
+
+_SAFE_FILENAME_TABLE = _SafeFilenameTable()
+
+
 def get_safe_filename(text: str, max_length: int = 50) -> str:
     """
     Convert text to a safe filename by removing/replacing problematic characters.
@@ -98,21 +357,8 @@ def get_safe_filename(text: str, max_length: int = 50) -> str:
         Safe filename string
     """
     
-    # Replace problematic characters
-    safe_chars = []
-    for char in text:
-        if char.isalnum() or char in '-_':
-            safe_chars.append(char)
-        elif char in ' /\\:*"<>|':
-            safe_chars.append('_')
-    
-    safe_text = ''.join(safe_chars)
-    
-    # Truncate if too long
-    if len(safe_text) > max_length:
-        safe_text = safe_text[:max_length]
-    
-    return safe_text
+    # Replace problematic characters and drop the rest in one C-level pass
+    return text.translate(_SAFE_FILENAME_TABLE)[:max_length]
 
 
 def calculate_progress_percentage(current: int, total: int) -> float:
@@ -155,6 +401,37 @@ def estimate_remaining_time(elapsed_time: float, current: int, total: int) -> fl
     return time_per_item * remaining_items
 
 
+def progress_stats(elapsed: np.ndarray, currents: np.ndarray, total: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Progress percentages and remaining-time estimates for many steps at once.
+    
+    Array version of calculate_progress_percentage() and estimate_remaining_time()
+    for analysing a whole run's timing log without a Python loop.
+    
+    Args:
+        elapsed: Time elapsed at each step (seconds)
+        currents: Items completed at each step
+        total: Total number of items
+        
+    Returns:
+        Tuple of (progress percentages, estimated remaining seconds) arrays
+    """
+    
+    elapsed = np.asarray(elapsed, dtype=np.float64)
+    currents = np.asarray(currents, dtype=np.float64)
+    
+    if total <= 0:
+        percentages = np.zeros_like(currents)
+    else:
+        percentages = np.minimum(100.0, currents * (100.0 / total))
+    
+    # Nothing is known about the pace before the first item completes
+    time_per_item = elapsed / np.maximum(currents, 1.0)
+    remaining = np.where(currents > 0, time_per_item * (total - currents), 0.0)
+    
+    return percentages, remaining
+
+
 def format_time_duration(seconds: float) -> str:
     """
     Format time duration in human-readable format.
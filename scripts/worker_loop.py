@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Persistent Blender Worker for the Lighting GUI
+
+Runs inside a single long-lived Blender process and renders GUI test images on
+request, so Blender start-up, module imports and Cycles kernel compilation are
+paid once per GUI session instead of once per click. The cylinder, text and
+camera are built on the first request and reused afterwards.
+
+Protocol: one JSON object per stdin line. After handling a request the worker
+prints one line starting with DONE_SENTINEL followed by a JSON status object.
+
+    {"cmd": "render", "params": {"env_strength": 0.8, "key_light": true, ...}}
+    {"cmd": "quit"}
+
+Usage:
+    blender --background --python scripts/worker_loop.py
+
+Author: Gas Tank Text Generator Project
+Date: July 2025
+"""
+
+import sys
+import json
+import traceback
+from pathlib import Path
+
+# Add the scripts directory to Python path for imports
+script_dir = Path(__file__).parent
+sys.path.append(str(script_dir))
+
+try:
+    import bpy
+except ImportError:
+    print("Error: This script must be run from within Blender")
+    print("Usage: blender --background --python scripts/worker_loop.py")
+    sys.exit(1)
+
+from cylinder_generator import CylinderGenerator
+from text_embosser import TextEmbosser
+from lighting_camera import LightingCameraController
+
+# Marks the end of the output belonging to one request (Blender logs to stdout too)
+DONE_SENTINEL = "###DONE###"
+
+PROJECT_PATH = script_dir.parent
+
+# GUI lights: name -> (type, location, rotation, area size)
+GUI_LIGHTS = {
+    "GUIKeyLight": ('SUN', (5, 5, 8), (0.7, 0, 0.78), None),
+    "GUIFillLight": ('AREA', (-3, 2, 6), (0.5, 0, -0.5), 4.0),
+    "GUIRimLight": ('SPOT', (-4, -4, 6), (0.6, 0, -2.3), None),
+    "DefaultLight": ('SUN', (3, 3, 6), (0.7, 0, 0.78), None),
+}
+
+
+class GuiRenderWorker:
+    """Keeps the GUI test scene alive between renders and applies lighting settings."""
+    
+    def __init__(self):
+        """Initialize the worker; the scene itself is built on the first render."""
+        
+        self.cylinder = None
+        self.output_path = str(PROJECT_PATH / "output" / "images" / "gui_test.png")
+    
+    def render(self, params: dict) -> dict:
+        """
+        Apply the GUI lighting settings and render the test image.
+        
+        Args:
+            params: Lighting settings sent by the GUI
+        
+        Returns:
+            Status fields for the reply
+        """
+        
+        if self.cylinder is None:
+            self._setup_scene()
+        
+        self._setup_world(params['env_strength'])
+        self._setup_lights(params)
+        
+        print(f"Environment strength: {params['env_strength']}")
+        
+        # Render
+        print("Starting render...")
+        bpy.ops.render.render(write_still=True)
+        print("✅ GUI test image saved to output/images/gui_test.png")
+        
+        return {"path": self.output_path}
+    
+    def _setup_scene(self) -> None:
+        """Build the cylinder, debossed text, camera and render settings once."""
+        
+        # Clear scene
+        for obj in list(bpy.data.objects):
+            bpy.data.objects.remove(obj, do_unlink=True)
+        
+        # Create cylinder and text
+        cylinder_gen = CylinderGenerator()
+        self.cylinder = cylinder_gen.create_cylinder(size_type='medium')
+        
+        # Create text embosser with correct parameters
+        text_embosser = TextEmbosser(font_dir=str(PROJECT_PATH / "fonts"), font_style="default")
+        text_embosser.apply_debossed_text(self.cylinder, "GUI-TEST")
+        
+        # Frame the cylinder in camera view - manual positioning since
+        # camera_to_view_selected doesn't work in background
+        camera = bpy.data.objects.new("GUICamera", bpy.data.cameras.new("GUICamera"))
+        bpy.context.collection.objects.link(camera)
+        bpy.context.scene.camera = camera
+        camera.data.lens = 50  # 50mm lens
+        
+        camera.matrix_world = LightingCameraController.frame_object(self.cylinder)
+        
+        print(f"Positioned camera at {tuple(camera.matrix_world.translation)} "
+              f"looking at {tuple(self.cylinder.location)}")
+        
+        # Render settings
+        scene = bpy.context.scene
+        scene.render.resolution_x = 512
+        scene.render.resolution_y = 256
+        scene.render.filepath = self.output_path
+        
+        # Set render engine and samples for faster preview
+        scene.render.engine = 'CYCLES'
+        scene.cycles.samples = 32  # Reduced for faster GUI testing
+    
+    def _setup_world(self, strength: float) -> None:
+        """
+        Set the world background, building its nodes on first use.
+        
+        Args:
+            strength: Background strength
+        """
+        
+        world = bpy.context.scene.world
+        if not world:
+            world = bpy.data.worlds.new("World")
+            bpy.context.scene.world = world
+        
+        background = world.node_tree.nodes.get("GUIBackground") if world.use_nodes else None
+        if background is None:
+            world.use_nodes = True
+            world.node_tree.nodes.clear()
+            
+            background = world.node_tree.nodes.new(type='ShaderNodeBackground')
+            background.name = "GUIBackground"
+            background.inputs['Color'].default_value = (0.9, 0.9, 0.9, 1.0)  # Brighter background
+            
+            output = world.node_tree.nodes.new(type='ShaderNodeOutputWorld')
+            world.node_tree.links.new(background.outputs['Background'], output.inputs['Surface'])
+        
+        background.inputs['Strength'].default_value = strength
+    
+    def _setup_lights(self, params: dict) -> None:
+        """
+        Set the GUI light energies, creating the lights on first use.
+        
+        Disabled lights are kept with zero energy rather than removed so the
+        light count, depsgraph relations and compiled render kernels stay the
+        same between requests.
+        
+        Args:
+            params: Lighting settings sent by the GUI
+        """
+        
+        any_enabled = params['key_light'] or params['fill_light'] or params['rim_light']
+        energies = {
+            "GUIKeyLight": params['key_intensity'] if params['key_light'] else 0.0,
+            "GUIFillLight": params['fill_intensity'] if params['fill_light'] else 0.0,
+            "GUIRimLight": params['rim_intensity'] if params['rim_light'] else 0.0,
+            # Basic lighting for when no directional lights are enabled
+            "DefaultLight": 0.0 if any_enabled else 2.0,
+        }
+        
+        for name, energy in energies.items():
+            light = bpy.data.objects.get(name)
+            if light is None:
+                light = self._create_light(name)
+            light.data.energy = energy
+            print(f"{name} energy: {energy}")
+    
+    def _create_light(self, name: str):
+        """
+        Add one of the GUI lights at its fixed position.
+        
+        Args:
+            name: Name from GUI_LIGHTS
+        
+        Returns:
+            The new light object
+        """
+        
+        light_type, location, rotation, size = GUI_LIGHTS[name]
+        light = bpy.data.objects.new(name, bpy.data.lights.new(name, light_type))
+        bpy.context.collection.objects.link(light)
+        light.location = location
+        light.rotation_euler = rotation  # Point toward cylinder
+        if size is not None:
+            light.data.size = size
+        return light
+
+
+def main():
+    """Serve requests from stdin until it closes or a quit command arrives."""
+    
+    # stdout is a pipe to the GUI; flush every line so progress arrives during a render
+    sys.stdout.reconfigure(line_buffering=True)
+    
+    worker = GuiRenderWorker()
+    
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        
+        try:
+            request = json.loads(line)
+            command = request.get('cmd')
+            
+            if command == 'quit':
+                break
+            elif command == 'render':
+                status = {'ok': True, **worker.render(request['params'])}
+            else:
+                raise ValueError(f"Unknown command: {command}")
+        
+        except Exception as e:
+            traceback.print_exc()
+            status = {'ok': False, 'error': str(e)}
+        
+        print(f"{DONE_SENTINEL} {json.dumps(status)}", flush=True)
+
+
+if __name__ == "__main__":
+    main()